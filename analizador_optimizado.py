@@ -135,15 +135,8 @@ class OptimizedGPTAnalyzer:
             Lista de registros sin análisis
         """
         try:
-            # Buscar registros que no tengan análisis
-            response = self.supabase_manager.client.table('precios_modulos').select('*').execute()
-            
-            # Filtrar registros que no tengan análisis GPT
-            unanalyzed = []
-            for record in response.data:
-                # Verificar si ya fue analizado
-                if not record.get('analizado_gpt', False):
-                    unanalyzed.append(record)
+            # Filtrar en el servidor (índice parcial sobre analizado_gpt = false)
+            unanalyzed = self.supabase_manager.get_unanalyzed_data()
             
             logger.info(f"📊 Encontrados {len(unanalyzed)} registros para analizar")
             return unanalyzed
@@ -316,4 +309,11 @@ async def main():
         logger.info("💡 Verifica que tengas las dependencias instaladas y las credenciales configuradas")
 
 if __name__ == "__main__":
+    # Event loop de uvloop cuando está instalado (uvloop no existe en Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main()) 
\ No newline at end of file
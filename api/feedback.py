@@ -19,6 +19,14 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# Sesión compartida: reutiliza la conexión TCP/TLS con Supabase entre peticiones
+SESSION = requests.Session()
+SESSION.headers.update({
+    "apikey": SUPABASE_KEY,
+    "Authorization": f"Bearer {SUPABASE_KEY}",
+    "Content-Type": "application/json"
+})
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
@@ -63,16 +71,8 @@ async def guardar_feedback(feedback: FeedbackRequest):
         # URL de la API REST de Supabase para la tabla retroalimentacion
         url = f"{SUPABASE_URL}/rest/v1/retroalimentacion"
         
-        # Headers necesarios para Supabase
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation"
-        }
-        
         # Hacer la petición POST a Supabase
-        response = requests.post(url, json=data, headers=headers)
+        response = SESSION.post(url, json=data, headers={"Prefer": "return=representation"})
         
         if response.status_code == 201:
             # Supabase devuelve el registro insertado
@@ -134,14 +134,8 @@ async def obtener_feedback(
         # URL de la API REST de Supabase para obtener datos
         url = f"{SUPABASE_URL}/rest/v1/retroalimentacion?select=*&order=fecha.desc"
         
-        # Headers necesarios para Supabase
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-        
         # Hacer la petición GET a Supabase
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url)
         
         if response.status_code == 200:
             data = response.json()
@@ -175,14 +169,8 @@ async def analizar_feedback_producto(producto: str, mercado: str):
         # Obtener feedbacks específicos
         url = f"{SUPABASE_URL}/rest/v1/retroalimentacion?select=*&order=fecha.desc"
         
-        # Headers necesarios para Supabase
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-        
         # Hacer la petición GET a Supabase
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url)
         
         if response.status_code == 200:
             feedbacks = response.json()
@@ -318,14 +306,8 @@ async def eliminar_feedback(feedback_id: str):
         # URL de la API REST de Supabase para eliminar un registro
         url = f"{SUPABASE_URL}/rest/v1/retroalimentacion?id=eq.{feedback_id}"
         
-        # Headers necesarios para Supabase
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-        
         # Hacer la petición DELETE a Supabase
-        response = requests.delete(url, headers=headers)
+        response = SESSION.delete(url)
         
         if response.status_code == 204:
             return {
@@ -359,14 +341,8 @@ async def obtener_estadisticas():
         # URL de la API REST de Supabase para obtener datos
         url = f"{SUPABASE_URL}/rest/v1/retroalimentacion?select=*&order=fecha.desc"
         
-        # Headers necesarios para Supabase
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-        
         # Hacer la petición GET a Supabase
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url)
         
         if response.status_code == 200:
             feedbacks = response.json()
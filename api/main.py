@@ -9,6 +9,7 @@ import asyncio
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,7 +25,7 @@ logger = logging.getLogger(__name__)
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from supabase_client import SupabaseManager
+from supabase_client import SupabaseManager, AsyncSupabaseManager
 from utils.optimized_analyzer import OptimizedAnalyzer
 from utils.model_manager import ModelManager
 from utils.extract_price import extract_price_from_text, clean_text, extract_pricing_terms, validate_price_extraction
@@ -37,13 +38,42 @@ except ImportError as e:
     logger.warning(f"⚠️ No se pudo importar router de feedback: {str(e)}")
     feedback_router = None
 
+# Inicializar componentes del sistema
+try:
+    supabase_manager = SupabaseManager()
+    optimized_analyzer = OptimizedAnalyzer(use_local_models=True, use_gpt=True)
+    model_manager = ModelManager()
+    logger.info("✅ Componentes del sistema inicializados correctamente")
+except Exception as e:
+    logger.error(f"❌ Error inicializando componentes: {str(e)}")
+    supabase_manager = None
+    optimized_analyzer = None
+    model_manager = None
+
+# Cliente asíncrono de Supabase (su fallo no desactiva el resto de componentes)
+try:
+    async_supabase_manager = AsyncSupabaseManager()
+except Exception as e:
+    logger.error(f"❌ Error inicializando cliente asíncrono de Supabase: {str(e)}")
+    async_supabase_manager = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cerrar clientes HTTP al apagar la API."""
+    yield
+    if async_supabase_manager:
+        await async_supabase_manager.aclose()
+    if optimized_analyzer:
+        await optimized_analyzer.aclose()
+
 # Inicializar FastAPI
 app = FastAPI(
     title="Web Scraper API con Hugging Face",
     description="API para análisis de proveedores de marca blanca con modelos locales y GPT",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -62,18 +92,6 @@ if feedback_router:
 else:
     logger.warning("⚠️ Router de feedback no disponible")
 
-# Inicializar componentes del sistema
-try:
-    supabase_manager = SupabaseManager()
-    optimized_analyzer = OptimizedAnalyzer(use_local_models=True, use_gpt=True)
-    model_manager = ModelManager()
-    logger.info("✅ Componentes del sistema inicializados correctamente")
-except Exception as e:
-    logger.error(f"❌ Error inicializando componentes: {str(e)}")
-    supabase_manager = None
-    optimized_analyzer = None
-    model_manager = None
-
 # Modelos Pydantic para requests/responses
 class TextAnalysisRequest(BaseModel):
     text: str = Field(..., description="Texto a analizar")
@@ -366,8 +384,8 @@ async def get_model_info(request: ModelInfoRequest = None):
         if optimized_analyzer:
             model_info["analyzer_stats"] = optimized_analyzer.get_analysis_stats()
         
-        if supabase_manager:
-            model_info["supabase_stats"] = supabase_manager.get_statistics()
+        if async_supabase_manager:
+            model_info["supabase_stats"] = await async_supabase_manager.get_statistics()
         
         processing_time = (datetime.now() - start_time).total_seconds()
         
@@ -395,8 +413,8 @@ async def get_system_stats():
             "api_status": "active"
         }
         
-        if supabase_manager:
-            stats["supabase"] = supabase_manager.get_statistics()
+        if async_supabase_manager:
+            stats["supabase"] = await async_supabase_manager.get_statistics()
         
         if optimized_analyzer:
             stats["analyzer"] = optimized_analyzer.get_analysis_stats()
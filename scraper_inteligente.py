@@ -408,30 +408,29 @@ Responde en formato JSON:
             for module, module_results in results.items():
                 module_stats = {'stored': 0, 'validated': 0, 'errors': 0}
                 
-                for result in module_results:
-                    try:
-                        # Validar y almacenar
-                        validation_result = pinecone_manager.validate_and_store(
-                            result['texto'],
-                            result['metadata']
-                        )
-                        
-                        if validation_result['stored']:
-                            stats['total_stored'] += 1
-                            module_stats['stored'] += 1
-                            
-                            if validation_result['validated']:
-                                stats['validated'] += 1
-                                module_stats['validated'] += 1
-                        
-                        # Contar por país
-                        country = result['metadata'].get('pais', 'Unknown')
-                        stats['by_country'][country] = stats['by_country'].get(country, 0) + 1
+                try:
+                    # Validar y almacenar el módulo completo en lote
+                    validation_results = pinecone_manager.validate_and_store_bulk(
+                        [(result['texto'], result['metadata']) for result in module_results]
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Error guardando en Pinecone: {str(e)}")
+                    stats['errors'] += len(module_results)
+                    module_stats['errors'] += len(module_results)
+                    validation_results = []
+                
+                for result, validation_result in zip(module_results, validation_results):
+                    if validation_result['stored']:
+                        stats['total_stored'] += 1
+                        module_stats['stored'] += 1
                         
-                    except Exception as e:
-                        logger.error(f"❌ Error guardando en Pinecone: {str(e)}")
-                        stats['errors'] += 1
-                        module_stats['errors'] += 1
+                        if validation_result['validated']:
+                            stats['validated'] += 1
+                            module_stats['validated'] += 1
+                    
+                    # Contar por país
+                    country = result['metadata'].get('pais', 'Unknown')
+                    stats['by_country'][country] = stats['by_country'].get(country, 0) + 1
                 
                 stats['by_module'][module] = module_stats
             
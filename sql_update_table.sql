@@ -10,12 +10,24 @@ ADD COLUMN IF NOT EXISTS confianza_analisis VARCHAR(50),
 ADD COLUMN IF NOT EXISTS fecha_analisis_gpt TIMESTAMP WITH TIME ZONE,
 ADD COLUMN IF NOT EXISTS analizado_gpt BOOLEAN DEFAULT FALSE;
 
+-- fecha_extraccion la asigna el servidor; los clientes ya no la envían
+UPDATE precios_modulos SET fecha_extraccion = NOW() WHERE fecha_extraccion IS NULL;
+ALTER TABLE precios_modulos ALTER COLUMN fecha_extraccion SET DEFAULT NOW();
+ALTER TABLE precios_modulos ALTER COLUMN fecha_extraccion SET NOT NULL;
+
 -- Crear índices para mejorar el rendimiento de consultas
 CREATE INDEX IF NOT EXISTS idx_precios_modulos_fuente ON precios_modulos(fuente);
 CREATE INDEX IF NOT EXISTS idx_precios_modulos_clasificacion ON precios_modulos(clasificacion_gpt);
 CREATE INDEX IF NOT EXISTS idx_precios_modulos_analizado ON precios_modulos(analizado_gpt);
 CREATE INDEX IF NOT EXISTS idx_precios_modulos_fecha ON precios_modulos(fecha);
 
+-- Índice parcial: solo contiene los registros pendientes de análisis, por lo que
+-- get_unanalyzed_data tiene costo constante aunque la tabla crezca
+CREATE INDEX IF NOT EXISTS precios_modulos_unanalyzed ON precios_modulos(id, fecha_extraccion) WHERE analizado_gpt = FALSE;
+
+-- Tabla de staging sin WAL para restauraciones masivas (COPY + INSERT ... SELECT)
+CREATE UNLOGGED TABLE IF NOT EXISTS precios_modulos_stage (LIKE precios_modulos INCLUDING DEFAULTS);
+
 -- Crear vista para datos analizados
 CREATE OR REPLACE VIEW datos_analizados AS
 SELECT 
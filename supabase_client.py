@@ -6,8 +6,11 @@ Implementa patrones de desarrollo robusto y manejo de errores.
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional, Union
+import importlib.util
+import itertools
+from typing import Dict, List, Any, Optional, Union, Iterator
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 from dotenv import load_dotenv
 
@@ -26,6 +29,60 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     Client = None
 
+try:
+    import psycopg
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    # HTTP/2 requiere el paquete h2 (pip install httpx[http2])
+    HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP2_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Umbral a partir del cual se usa COPY directo en lugar de PostgREST
+COPY_BATCH_THRESHOLD = 1000
+
+# Columnas que necesitan los analizadores para registros pendientes
+UNANALYZED_COLUMNS = 'id,fuente,texto_extraido'
+
+# Tabla UNLOGGED usada como staging en restauraciones masivas
+STAGING_TABLE = 'precios_modulos_stage'
+
+# Tipos Parquet de las columnas no textuales de precios_modulos. El esquema se
+# declara en lugar de inferirlo de la primera página: una columna toda nula en
+# ella quedaría con tipo null y fallaría al llegar valores en páginas siguientes.
+# El resto de columnas se guarda como texto
+PARQUET_COLUMN_TYPES = {
+    'id': 'int64',
+    'analizado_gpt': 'bool',
+}
+# Columnas JSONB: se guardan como texto JSON y se decodifican al leer el backup
+PARQUET_JSON_COLUMNS = ('condiciones_comerciales',)
+
 class SupabaseManager:
     """
     Gestor optimizado para Supabase con funcionalidades avanzadas.
@@ -43,11 +100,63 @@ class SupabaseManager:
             raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar configurados en .env")
         
         try:
-            self.client = create_client(self.url, self.key)
+            options = self._build_client_options()
+            if options is not None:
+                self.client = create_client(self.url, self.key, options=options)
+            else:
+                self.client = create_client(self.url, self.key)
             logger.info("✅ Conexión a Supabase establecida")
         except Exception as e:
             logger.error(f"❌ Error conectando a Supabase: {str(e)}")
             raise
+        
+        # Conexión directa a Postgres (opcional) para cargas masivas
+        self.db_url = os.getenv('SUPABASE_DB_URL')
+        self._db_connection = None
+    
+    def _build_client_options(self):
+        """
+        Construir opciones del cliente con un httpx.Client HTTP/2 con keep-alive,
+        para multiplexar las peticiones a PostgREST sobre una sola conexión TLS.
+        
+        Returns:
+            ClientOptions o None si no está soportado
+        """
+        if not HTTP2_AVAILABLE:
+            return None
+        
+        try:
+            from supabase.lib.client_options import ClientOptions
+            
+            http_client = httpx.Client(
+                transport=httpx.HTTPTransport(http2=True, retries=2),
+                limits=httpx.Limits(
+                    max_connections=32,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=300
+                )
+            )
+            return ClientOptions(httpx_client=http_client)
+        except (ImportError, TypeError) as e:
+            # Versiones de supabase-py sin soporte para httpx_client
+            logger.warning(f"⚠️ Cliente HTTP/2 no disponible, usando el cliente por defecto: {str(e)}")
+            return None
+    
+    def _get_db_connection(self):
+        """
+        Obtener conexión directa a Postgres para operaciones masivas.
+        
+        Returns:
+            Conexión psycopg o None si no está configurada
+        """
+        if not PSYCOPG_AVAILABLE or not self.db_url:
+            return None
+        
+        if self._db_connection is None or self._db_connection.closed:
+            self._db_connection = psycopg.connect(self.db_url)
+            logger.info("✅ Conexión directa a Postgres establecida")
+        
+        return self._db_connection
     
     def test_connection(self) -> Dict[str, Any]:
         """
@@ -57,8 +166,8 @@ class SupabaseManager:
             Estado de la conexión
         """
         try:
-            # Intentar una consulta simple
-            response = self.client.table('precios_modulos').select('count', count='exact').limit(1).execute()
+            # Consulta HEAD: solo devuelve el conteo, sin filas
+            response = self.client.table('precios_modulos').select('*', count='exact', head=True).execute()
             
             return {
                 "status": "connected",
@@ -91,10 +200,6 @@ class SupabaseManager:
                 if field not in data:
                     raise ValueError(f"Campo requerido faltante: {field}")
             
-            # Agregar timestamp si no existe
-            if 'fecha_extraccion' not in data:
-                data['fecha_extraccion'] = datetime.now().isoformat()
-            
             # Insertar datos
             response = self.client.table('precios_modulos').insert(data).execute()
             
@@ -123,11 +228,6 @@ class SupabaseManager:
         inserted_ids = []
         
         try:
-            # Preparar datos para inserción en lote
-            for data in data_list:
-                if 'fecha_extraccion' not in data:
-                    data['fecha_extraccion'] = datetime.now().isoformat()
-            
             # Insertar en lote
             response = self.client.table('precios_modulos').insert(data_list).execute()
             
@@ -146,6 +246,74 @@ class SupabaseManager:
         
         return inserted_ids
     
+    @staticmethod
+    def _copy_rows(cur, table: str, columns: List[str], rows) -> int:
+        """
+        Escribir filas con COPY ... FROM STDIN sobre un cursor abierto.
+        
+        Args:
+            cur: Cursor psycopg
+            table: Tabla destino
+            columns: Columnas a cargar
+            rows: Iterable de diccionarios
+            
+        Returns:
+            Número de filas copiadas
+        """
+        column_list = ", ".join(columns)
+        row_count = 0
+        with cur.copy(f"COPY {table} ({column_list}) FROM STDIN") as copy:
+            for data in rows:
+                copy.write_row(tuple(
+                    json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                    for value in (data.get(column) for column in columns)
+                ))
+                row_count += 1
+        return row_count
+    
+    def copy_batch_data(self, data_list: List[Dict[str, Any]]) -> int:
+        """
+        Cargar registros con COPY directo a Postgres, sin pasar por PostgREST.
+        
+        Args:
+            data_list: Lista de datos a insertar
+            
+        Returns:
+            Número de registros cargados
+        """
+        conn = self._get_db_connection()
+        if conn is None:
+            raise RuntimeError("SUPABASE_DB_URL y psycopg son necesarios para COPY")
+        
+        # Columnas en orden de aparición (unión de todas las claves)
+        columns = list(dict.fromkeys(key for data in data_list for key in data))
+        
+        with conn.cursor() as cur:
+            row_count = self._copy_rows(cur, 'precios_modulos', columns, data_list)
+        conn.commit()
+        
+        logger.info(f"✅ {row_count} registros cargados con COPY")
+        return row_count
+    
+    def bulk_load_data(self, data_list: List[Dict[str, Any]]) -> int:
+        """
+        Insertar registros usando COPY para lotes grandes y PostgREST para lotes pequeños.
+        
+        Args:
+            data_list: Lista de datos a insertar
+            
+        Returns:
+            Número de registros insertados
+        """
+        if len(data_list) > COPY_BATCH_THRESHOLD and self._get_db_connection() is not None:
+            try:
+                return self.copy_batch_data(data_list)
+            except Exception as e:
+                logger.warning(f"⚠️ COPY falló, usando PostgREST: {str(e)}")
+                self._db_connection.rollback()
+        
+        return len(self.insert_batch_data(data_list))
+    
     def get_data(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """
         Obtener datos de la tabla precios_modulos.
@@ -175,6 +343,57 @@ class SupabaseManager:
             logger.error(f"❌ Error obteniendo datos: {str(e)}")
             return []
     
+    def _fetch_range(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """
+        Obtener un rango de registros ordenados por id (ambos extremos inclusivos).
+        
+        PostgREST no garantiza el orden sin ORDER BY: sin él, páginas consecutivas
+        podrían repetir u omitir registros.
+        
+        Args:
+            start: Índice inicial
+            end: Índice final
+            
+        Returns:
+            Lista de registros del rango
+        """
+        response = self.client.table('precios_modulos').select('*').order('id').range(start, end).execute()
+        return response.data
+    
+    def iter_pages(self, page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterar la tabla por páginas, solicitando la siguiente página en segundo plano
+        mientras el llamador procesa la actual.
+        
+        Los errores al obtener una página se propagan: el llamador no recibe
+        como completa una exportación truncada.
+        
+        Args:
+            page_size: Registros por página
+            
+        Yields:
+            Listas de registros de cada página
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            offset = 0
+            future = executor.submit(self._fetch_range, offset, offset + page_size - 1)
+            
+            while True:
+                page = future.result()
+                
+                if not page:
+                    return
+                
+                # Lanzar la siguiente página antes de entregar la actual
+                offset += page_size
+                if len(page) == page_size:
+                    future = executor.submit(self._fetch_range, offset, offset + page_size - 1)
+                
+                yield page
+                
+                if len(page) < page_size:
+                    return
+    
     def get_unanalyzed_data(self) -> List[Dict[str, Any]]:
         """
         Obtener datos no analizados por GPT.
@@ -183,7 +402,9 @@ class SupabaseManager:
             Lista de registros sin análisis
         """
         try:
-            response = self.client.table('precios_modulos').select('*').eq('analizado_gpt', False).execute()
+            # Solo las columnas que necesita el análisis; el índice parcial
+            # precios_modulos_unanalyzed cubre el filtro analizado_gpt = false
+            response = self.client.table('precios_modulos').select(UNANALYZED_COLUMNS).eq('analizado_gpt', False).execute()
             
             logger.info(f"📊 Encontrados {len(response.data)} registros sin analizar")
             return response.data
@@ -316,11 +537,11 @@ class SupabaseManager:
             }
             
             # Total de registros
-            total_response = self.client.table('precios_modulos').select('count', count='exact').execute()
+            total_response = self.client.table('precios_modulos').select('*', count='exact', head=True).execute()
             stats["total_records"] = total_response.count if hasattr(total_response, 'count') else 0
             
             # Registros analizados
-            analyzed_response = self.client.table('precios_modulos').select('count', count='exact').eq('analizado_gpt', True).execute()
+            analyzed_response = self.client.table('precios_modulos').select('*', count='exact', head=True).eq('analizado_gpt', True).execute()
             stats["analyzed_records"] = analyzed_response.count if hasattr(analyzed_response, 'count') else 0
             
             # Registros no analizados
@@ -364,13 +585,9 @@ class SupabaseManager:
         try:
             cutoff_date = datetime.now() - timedelta(days=days_old)
             
-            # Obtener registros antiguos
-            old_records = self.client.table('precios_modulos').select('id').lt('fecha_extraccion', cutoff_date.isoformat()).execute()
-            
-            deleted_count = 0
-            for record in old_records.data:
-                if self.delete_record(record['id']):
-                    deleted_count += 1
+            # Eliminar en una sola sentencia; PostgREST devuelve las filas borradas
+            response = self.client.table('precios_modulos').delete().lt('fecha_extraccion', cutoff_date.isoformat()).execute()
+            deleted_count = len(response.data) if response.data else 0
             
             logger.info(f"🧹 Eliminados {deleted_count} registros antiguos (> {days_old} días)")
             return deleted_count
@@ -384,31 +601,49 @@ class SupabaseManager:
         Exportar datos a archivo.
         
         Args:
-            format: Formato de exportación ('json', 'csv')
+            format: Formato de exportación ('json', 'csv', 'parquet')
             filename: Nombre del archivo (opcional)
             
         Returns:
             Ruta del archivo exportado
         """
         try:
-            # Obtener todos los datos
-            data = self.get_data()
-            
             if not filename:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"supabase_export_{timestamp}.{format}"
             
+            if format.lower() == 'parquet':
+                self._export_parquet(filename)
+                logger.info(f"📁 Datos exportados a {filename}")
+                return filename
+            
+            # Obtener todos los datos
+            data = self.get_data()
+            
             if format.lower() == 'json':
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                if ORJSON_AVAILABLE:
+                    # Serializar registro a registro sin indentación
+                    with open(filename, 'wb') as f:
+                        f.write(b'[')
+                        for i, row in enumerate(data):
+                            if i:
+                                f.write(b',')
+                            f.write(orjson.dumps(row, default=str))
+                        f.write(b']')
+                else:
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, default=str)
             
             elif format.lower() == 'csv':
                 import csv
                 if data:
+                    fieldnames = tuple(data[0].keys())
                     with open(filename, 'w', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(data)
+                        writer = csv.writer(f)
+                        writer.writerow(fieldnames)
+                        writer.writerows(
+                            tuple(row.get(field) for field in fieldnames) for row in data
+                        )
             
             logger.info(f"📁 Datos exportados a {filename}")
             return filename
@@ -417,17 +652,154 @@ class SupabaseManager:
             logger.error(f"❌ Error exportando datos: {str(e)}")
             return ""
     
+    @staticmethod
+    def _parquet_schema(columns: List[str]):
+        """
+        Esquema Parquet fijo para las columnas de precios_modulos.
+        
+        Args:
+            columns: Columnas de los registros exportados
+            
+        Returns:
+            Esquema pyarrow; las columnas JSON quedan anotadas en la metadata
+        """
+        fields = [pa.field(column, pa.type_for_alias(PARQUET_COLUMN_TYPES.get(column, 'string'))) for column in columns]
+        json_columns = [column for column in columns if column in PARQUET_JSON_COLUMNS]
+        return pa.schema(fields, metadata={'json_columns': json.dumps(json_columns)})
+    
+    @staticmethod
+    def _parquet_value(value: Any, column_type: str) -> Any:
+        """Adaptar un valor de PostgREST al tipo de su columna Parquet."""
+        if value is None or column_type != 'string' or isinstance(value, str):
+            return value
+        # dict/list (JSONB), números o booleanos en columnas de texto
+        return json.dumps(value, ensure_ascii=False, default=str)
+    
+    def _export_parquet(self, filename: str):
+        """
+        Exportar la tabla a Parquet (zstd) escribiendo página a página.
+        
+        Si la exportación falla no se deja un archivo parcial.
+        
+        Args:
+            filename: Ruta del archivo de salida
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow no está disponible. Instala: pip install pyarrow")
+        
+        writer = None
+        try:
+            for page in self.iter_pages():
+                if writer is None:
+                    # PostgREST devuelve todas las columnas en cada registro (select=*)
+                    columns = list(page[0].keys())
+                    column_types = [PARQUET_COLUMN_TYPES.get(column, 'string') for column in columns]
+                    writer = pq.ParquetWriter(filename, self._parquet_schema(columns), compression='zstd')
+                
+                arrays = {
+                    column: [self._parquet_value(row.get(column), column_type) for row in page]
+                    for column, column_type in zip(columns, column_types)
+                }
+                writer.write_table(pa.Table.from_pydict(arrays, schema=writer.schema))
+        except Exception:
+            # No dejar un archivo truncado que parezca un backup válido
+            if writer is not None:
+                writer.close()
+            if os.path.exists(filename):
+                os.remove(filename)
+            raise
+        
+        if writer is None:
+            # Tabla vacía: archivo solo con esquema para que el backup exista y sea legible
+            columns = list(PARQUET_COLUMN_TYPES) + list(PARQUET_JSON_COLUMNS)
+            writer = pq.ParquetWriter(filename, self._parquet_schema(columns), compression='zstd')
+        writer.close()
+    
     def backup_table(self) -> str:
         """
-        Crear backup de la tabla.
+        Crear backup de la tabla (Parquet si pyarrow está disponible, si no JSON).
         
         Returns:
             Ruta del archivo de backup
         """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f"backup_precios_modulos_{timestamp}.json"
+        format = 'parquet' if PYARROW_AVAILABLE else 'json'
+        backup_filename = f"backup_precios_modulos_{timestamp}.{format}"
+        
+        return self.export_data(format, backup_filename)
+    
+    def _iter_backup_rows(self, backup_file: str) -> Iterator[Dict[str, Any]]:
+        """
+        Leer un backup registro a registro sin cargarlo completo en memoria.
+        
+        Args:
+            backup_file: Ruta del archivo de backup (.json o .parquet)
+            
+        Yields:
+            Registros del backup
+        """
+        if backup_file.endswith('.parquet'):
+            if not PYARROW_AVAILABLE:
+                raise ImportError("pyarrow no está disponible. Instala: pip install pyarrow")
+            parquet_file = pq.ParquetFile(backup_file)
+            metadata = parquet_file.schema_arrow.metadata or {}
+            json_columns = json.loads(metadata.get(b'json_columns', b'[]'))
+            for batch in parquet_file.iter_batches():
+                for row in batch.to_pylist():
+                    for column in json_columns:
+                        if row[column] is not None:
+                            row[column] = json.loads(row[column])
+                    yield row
+        else:
+            if not IJSON_AVAILABLE:
+                raise ImportError("ijson no está disponible. Instala: pip install ijson")
+            with open(backup_file, 'rb') as f:
+                yield from ijson.items(f, 'item')
+    
+    def restore_from_backup_streaming(self, backup_file: str) -> int:
+        """
+        Restaurar un backup grande: COPY en streaming a una tabla UNLOGGED de staging
+        y un único INSERT ... SELECT hacia precios_modulos.
         
-        return self.export_data('json', backup_filename)
+        Args:
+            backup_file: Ruta del archivo de backup
+            
+        Returns:
+            Número de registros restaurados
+        """
+        conn = self._get_db_connection()
+        if conn is None:
+            raise RuntimeError("SUPABASE_DB_URL y psycopg son necesarios para la restauración en streaming")
+        
+        rows = self._iter_backup_rows(backup_file)
+        first_row = next(rows, None)
+        if first_row is None:
+            return 0
+        
+        # Las columnas se toman del primer registro del backup
+        columns = list(first_row.keys())
+        column_list = ", ".join(columns)
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"CREATE UNLOGGED TABLE IF NOT EXISTS {STAGING_TABLE} (LIKE precios_modulos INCLUDING DEFAULTS)")
+                cur.execute(f"TRUNCATE {STAGING_TABLE}")
+                
+                staged = self._copy_rows(cur, STAGING_TABLE, columns, itertools.chain([first_row], rows))
+                
+                cur.execute(
+                    f"INSERT INTO precios_modulos ({column_list}) "
+                    f"SELECT {column_list} FROM {STAGING_TABLE} ON CONFLICT DO NOTHING"
+                )
+                restored = cur.rowcount
+                cur.execute(f"TRUNCATE {STAGING_TABLE}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        logger.info(f"🔄 {staged} registros en staging, {restored} restaurados")
+        return restored
     
     def restore_from_backup(self, backup_file: str) -> bool:
         """
@@ -440,15 +812,236 @@ class SupabaseManager:
             True si se restauró correctamente
         """
         try:
-            with open(backup_file, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
+            # Con conexión directa se restaura en streaming (memoria constante)
+            if self._get_db_connection() is not None:
+                inserted_count = self.restore_from_backup_streaming(backup_file)
+                logger.info(f"🔄 Restaurados {inserted_count} registros desde backup")
+                return inserted_count > 0
+            
+            if backup_file.endswith('.parquet'):
+                if not PYARROW_AVAILABLE:
+                    raise ImportError("pyarrow no está disponible. Instala: pip install pyarrow")
+                backup_data = pq.read_table(backup_file).to_pylist()
+            else:
+                with open(backup_file, 'r', encoding='utf-8') as f:
+                    backup_data = json.load(f)
             
             # Insertar datos del backup
-            inserted_ids = self.insert_batch_data(backup_data)
+            inserted_count = self.bulk_load_data(backup_data)
             
-            logger.info(f"🔄 Restaurados {len(inserted_ids)} registros desde backup")
-            return len(inserted_ids) > 0
+            logger.info(f"🔄 Restaurados {inserted_count} registros desde backup")
+            return inserted_count > 0
             
         except Exception as e:
             logger.error(f"❌ Error restaurando desde backup: {str(e)}")
-            return False 
\ No newline at end of file
+            return False 
+
+class AsyncSupabaseManager:
+    """
+    Gestor asíncrono para Supabase sobre httpx.AsyncClient.
+    Permite que los endpoints async atiendan consultas concurrentes sin bloquear hilos.
+    """
+    
+    def __init__(self):
+        """Inicializar el gestor asíncrono de Supabase."""
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx no está disponible. Instala: pip install httpx")
+        
+        self.url = os.getenv('SUPABASE_URL')
+        self.key = os.getenv('SUPABASE_KEY')
+        
+        if not self.url or not self.key:
+            raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar configurados en .env")
+        
+        self.client = httpx.AsyncClient(
+            base_url=f"{self.url}/rest/v1",
+            headers={
+                "apikey": self.key,
+                "Authorization": f"Bearer {self.key}",
+                "Content-Type": "application/json"
+            },
+            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=300)
+        )
+        logger.info("✅ Cliente asíncrono de Supabase inicializado")
+    
+    async def aclose(self):
+        """Cerrar el cliente HTTP."""
+        await self.client.aclose()
+    
+    @staticmethod
+    def _parse_count(response) -> int:
+        """Extraer el total del header Content-Range (ej: '0-9/123')."""
+        content_range = response.headers.get('content-range', '')
+        total = content_range.rsplit('/', 1)[-1]
+        return int(total) if total.isdigit() else 0
+    
+    async def _count(self, params: Dict[str, str] = None) -> int:
+        """
+        Contar registros de precios_modulos.
+        
+        Args:
+            params: Filtros PostgREST (ej: {'analizado_gpt': 'eq.true'})
+            
+        Returns:
+            Número de registros
+        """
+        # HEAD: el total llega en Content-Range sin cuerpo de respuesta
+        response = await self.client.head(
+            '/precios_modulos',
+            params={'select': '*', **(params or {})},
+            headers={'Prefer': 'count=exact'}
+        )
+        response.raise_for_status()
+        return self._parse_count(response)
+    
+    async def insert_data(self, data: Dict[str, Any]) -> Optional[int]:
+        """
+        Insertar datos en la tabla precios_modulos.
+        
+        Args:
+            data: Datos a insertar
+            
+        Returns:
+            ID del registro insertado o None si falla
+        """
+        try:
+            required_fields = ['fuente', 'texto_extraido']
+            for field in required_fields:
+                if field not in data:
+                    raise ValueError(f"Campo requerido faltante: {field}")
+            
+            response = await self.client.post(
+                '/precios_modulos',
+                json=data,
+                headers={'Prefer': 'return=representation'}
+            )
+            response.raise_for_status()
+            
+            records = response.json()
+            if records:
+                record_id = records[0].get('id')
+                logger.info(f"✅ Datos insertados correctamente (ID: {record_id})")
+                return record_id
+            
+            logger.error("❌ No se pudo insertar datos")
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ Error insertando datos: {str(e)}")
+            return None
+    
+    async def get_data(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Obtener datos de la tabla precios_modulos.
+        
+        Args:
+            limit: Límite de registros
+            offset: Desplazamiento
+            
+        Returns:
+            Lista de registros
+        """
+        try:
+            params = {'select': '*'}
+            if limit:
+                params['limit'] = limit
+            if offset > 0:
+                params['offset'] = offset
+                params.setdefault('limit', 100)
+            
+            response = await self.client.get('/precios_modulos', params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            logger.info(f"📊 Obtenidos {len(data)} registros")
+            return data
+            
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo datos: {str(e)}")
+            return []
+    
+    async def update_record(self, record_id: int, update_data: Dict[str, Any]) -> bool:
+        """
+        Actualizar un registro específico.
+        
+        Args:
+            record_id: ID del registro a actualizar
+            update_data: Datos a actualizar
+            
+        Returns:
+            True si se actualizó correctamente
+        """
+        try:
+            response = await self.client.patch(
+                '/precios_modulos',
+                params={'id': f'eq.{record_id}'},
+                json=update_data,
+                headers={'Prefer': 'return=representation'}
+            )
+            response.raise_for_status()
+            
+            if response.json():
+                logger.info(f"✅ Registro {record_id} actualizado correctamente")
+                return True
+            
+            logger.error(f"❌ No se pudo actualizar registro {record_id}")
+            return False
+            
+        except Exception as e:
+            logger.error(f"❌ Error actualizando registro {record_id}: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _count_by(records: List[Dict[str, Any]], field: str) -> Dict[str, int]:
+        """Contar ocurrencias de un campo en una lista de registros."""
+        counts = {}
+        for record in records:
+            value = record.get(field, 'unknown')
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+    
+    async def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtener estadísticas de la base de datos lanzando las consultas en paralelo.
+        
+        Returns:
+            Estadísticas de la base de datos
+        """
+        try:
+            async def fetch(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+                response = await self.client.get('/precios_modulos', params=params)
+                response.raise_for_status()
+                return response.json()
+            
+            total, analyzed, sources, methods, recent = await asyncio.gather(
+                self._count(),
+                self._count({'analizado_gpt': 'eq.true'}),
+                fetch({'select': 'fuente'}),
+                fetch({'select': 'metodo_analisis', 'analizado_gpt': 'eq.true'}),
+                fetch({'select': '*', 'order': 'fecha_extraccion.desc', 'limit': 10})
+            )
+            
+            # La agregación es CPU; se saca del event loop
+            source_counts, method_counts = await asyncio.gather(
+                asyncio.to_thread(self._count_by, sources, 'fuente'),
+                asyncio.to_thread(self._count_by, methods, 'metodo_analisis')
+            )
+            
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "total_records": total,
+                "analyzed_records": analyzed,
+                "unanalyzed_records": total - analyzed,
+                "sources": source_counts,
+                "analysis_methods": method_counts,
+                "recent_activity": recent
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo estadísticas: {str(e)}")
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "error": str(e)
+            }
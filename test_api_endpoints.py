@@ -1,4 +1,5 @@
-import requests
+import asyncio
+import httpx
 import json
 from datetime import datetime
 
@@ -19,16 +20,16 @@ def print_result(endpoint_name, response):
     
     print(f"{'='*50}")
 
-def test_analyze():
+async def test_analyze(client):
     print("\n🧠 Probando análisis de texto...")
     data = {
         "text": "El precio del módulo de inventario es de $500 USD por mes",
         "source": "test_web"
     }
-    r = requests.post(f"{BASE_URL}/analyze", json=data)
+    r = await client.post("/analyze", json=data)
     print_result("Análisis de Texto", r)
 
-def test_analyze_batch():
+async def test_analyze_batch(client):
     print("\n📦 Probando análisis en lote...")
     data = {
         "texts": [
@@ -38,18 +39,18 @@ def test_analyze_batch():
         "use_local_models": True,
         "use_gpt_backup": True
     }
-    r = requests.post(f"{BASE_URL}/analyze-batch", json=data)
+    r = await client.post("/analyze-batch", json=data)
     print_result("Análisis en Lote", r)
 
-def test_scraping():
+async def test_scraping(client):
     print("\n🌐 Probando scraping...")
     data = {
         "url": "https://example.com"
     }
-    r = requests.post(f"{BASE_URL}/scraping/extraer", json=data)
+    r = await client.post("/scraping/extraer", json=data)
     print_result("Scraping Extraer Info", r)
 
-def test_feedback():
+async def test_feedback(client):
     print("\n💬 Probando feedback...")
     data = {
         "producto": "CRM",
@@ -58,88 +59,90 @@ def test_feedback():
         "calificacion": 5,
         "fuente": "cliente_test"
     }
-    r = requests.post(f"{BASE_URL}/feedback/guardar", json=data)
+    r = await client.post("/feedback/guardar", json=data)
     print_result("Guardar Feedback", r)
 
-def test_obtener_feedback():
+async def test_obtener_feedback(client):
     print("\n📋 Obteniendo feedback...")
-    r = requests.get(f"{BASE_URL}/feedback/obtener")
+    r = await client.get("/feedback/obtener")
     print_result("Obtener Feedback", r)
 
-def test_analizar_feedback():
+async def test_analizar_feedback(client):
     print("\n📊 Analizando feedback...")
-    r = requests.get(f"{BASE_URL}/feedback/analizar/CRM/México")
+    r = await client.get("/feedback/analizar/CRM/México")
     print_result("Analizar Feedback", r)
 
-def test_estadisticas():
+async def test_estadisticas(client):
     print("\n📈 Obteniendo estadísticas...")
-    r = requests.get(f"{BASE_URL}/feedback/estadisticas")
+    r = await client.get("/feedback/estadisticas")
     print_result("Estadísticas", r)
 
-def test_documentos_scrapings():
+async def test_documentos_scrapings(client):
     print("\n📄 Probando consulta de documentos scrapings...")
-    r = requests.get(f"{BASE_URL}/scraping/documentos?limit=10")
+    r = await client.get("/scraping/documentos?limit=10")
     print_result("Documentos Scrapings", r)
 
-def test_documento_especifico():
+async def test_documento_especifico(client):
     print("\n🔍 Probando documento específico...")
     # Primero obtenemos la lista para ver si hay documentos
-    r_list = requests.get(f"{BASE_URL}/scraping/documentos?limit=1")
+    r_list = await client.get("/scraping/documentos?limit=1")
     if r_list.status_code == 200:
         data = r_list.json()
         if data.get("documentos") and len(data["documentos"]) > 0:
             doc_id = data["documentos"][0]["id"]
-            r = requests.get(f"{BASE_URL}/scraping/documentos/{doc_id}")
+            r = await client.get(f"/scraping/documentos/{doc_id}")
             print_result(f"Documento Específico (ID: {doc_id})", r)
         else:
             print("No hay documentos para probar")
     else:
         print("Error obteniendo lista de documentos")
 
-def test_model_info():
+async def test_model_info(client):
     print("\n🤖 Obteniendo información de modelos...")
-    r = requests.get(f"{BASE_URL}/model-info")
+    r = await client.get("/model-info")
     print_result("Model Info", r)
 
-def test_stats():
+async def test_stats(client):
     print("\n📊 Obteniendo estadísticas del sistema...")
-    r = requests.get(f"{BASE_URL}/stats")
+    r = await client.get("/stats")
     print_result("System Stats", r)
 
-def test_function_definitions():
+async def test_function_definitions(client):
     print("\n🔧 Obteniendo definiciones de funciones...")
-    r = requests.get(f"{BASE_URL}/function-definitions")
+    r = await client.get("/function-definitions")
     print_result("Function Definitions", r)
 
+async def main():
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=60.0) as client:
+        # Los endpoints independientes se lanzan en paralelo
+        await asyncio.gather(
+            test_analyze(client),
+            test_analyze_batch(client),
+            test_scraping(client),
+            test_feedback(client),
+            test_obtener_feedback(client),
+            test_analizar_feedback(client),
+            test_estadisticas(client),
+            test_documentos_scrapings(client),
+            test_model_info(client),
+            test_stats(client),
+            test_function_definitions(client)
+        )
+        
+        # Depende de la lista de documentos, se ejecuta después
+        await test_documento_especifico(client)
+
 if __name__ == "__main__":
     print("🚀 Iniciando pruebas de endpoints de la API")
     print(f"Base URL: {BASE_URL}")
     
     try:
-        # Pruebas básicas
-        test_analyze()
-        test_analyze_batch()
-        test_scraping()
-        
-        # Pruebas de feedback
-        test_feedback()
-        test_obtener_feedback()
-        test_analizar_feedback()
-        test_estadisticas()
-        
-        # Pruebas de documentos scrapings
-        test_documentos_scrapings()
-        test_documento_especifico()
-        
-        # Pruebas de información del sistema
-        test_model_info()
-        test_stats()
-        test_function_definitions()
+        asyncio.run(main())
         
         print("\n✅ Todas las pruebas completadas")
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"❌ No se pudo conectar a {BASE_URL}")
         print("Asegúrate de que el servidor esté ejecutándose")
     except Exception as e:
-        print(f"❌ Error durante las pruebas: {str(e)}") 
\ No newline at end of file
+        print(f"❌ Error durante las pruebas: {str(e)}")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Pruebas de regresión de extract_price_from_text.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.extract_price import extract_price_from_text, extract_prices_batch
+
+def test_patrones_solapados_cuentan_como_candidatos():
+    """Un rango no oculta coincidencias solapadas de patrones de mayor prioridad."""
+    assert extract_price_from_text("Pricing: 100 - 200 dollars per month") == "$200.00"
+    assert extract_price_from_text("Pricing starts at 99 USD, setup 10 - 20 dollars") == "$20.00"
+
+def test_prioridad_de_simbolo_de_moneda():
+    """Los precios con símbolo de moneda tienen prioridad sobre el resto."""
+    assert extract_price_from_text("Setup fee 500, plan price $1,200 per month") == "$1,200"
+
+def test_sin_precio():
+    """Sin números no hay precio."""
+    assert extract_price_from_text("Contact sales for pricing") is None
+
+def test_extract_prices_batch():
+    """El lote devuelve lo mismo que extract_price_from_text, en orden."""
+    textos = ["Plan price $99 per month", "", None, "Plan price $99 per month", "Sin precio"]
+    esperado = [extract_price_from_text(texto) if texto else None for texto in textos]
+    assert extract_prices_batch(textos) == esperado
+    assert extract_prices_batch(iter(textos)) == esperado
@@ -5,6 +5,7 @@ Verifica que todos los componentes funcionen correctamente
 """
 
 import asyncio
+import importlib.util
 import os
 import sys
 from typing import List, Dict, Any
@@ -13,17 +14,19 @@ def verificar_dependencias():
     """Verificar que todas las dependencias estén instaladas"""
     print("🔍 Verificando dependencias...")
     
-    dependencias = [
-        'openai', 'pinecone', 'langchain', 'sentence_transformers',
-        'requests', 'beautifulsoup4', 'numpy', 'pandas'
-    ]
+    # Paquete -> nombre de importación (beautifulsoup4 se importa como bs4)
+    dependencias = {
+        'openai': 'openai', 'pinecone': 'pinecone', 'langchain': 'langchain',
+        'sentence_transformers': 'sentence_transformers', 'requests': 'requests',
+        'beautifulsoup4': 'bs4', 'numpy': 'numpy', 'pandas': 'pandas'
+    }
     
     faltantes = []
-    for dep in dependencias:
-        try:
-            __import__(dep)
+    for dep, modulo in dependencias.items():
+        # find_spec localiza el módulo sin ejecutarlo
+        if importlib.util.find_spec(modulo) is not None:
             print(f"✅ {dep}")
-        except ImportError:
+        else:
             print(f"❌ {dep} - FALTANTE")
             faltantes.append(dep)
     
@@ -69,25 +72,25 @@ async def test_componentes():
         # Test 1: ScraperInteligente
         print("1. Probando ScraperInteligente...")
         from scraper_inteligente import ScraperInteligente
-        scraper = ScraperInteligente()
+        scraper = await asyncio.to_thread(ScraperInteligente)
         print("✅ ScraperInteligente inicializado")
         
         # Test 2: PineconeManager
         print("2. Probando PineconeManager...")
         from utils.pinecone_manager import PineconeManager
-        pinecone_manager = PineconeManager()
+        pinecone_manager = await asyncio.to_thread(PineconeManager)
         print("✅ PineconeManager inicializado")
         
         # Test 3: ChatGPTManager
         print("3. Probando ChatGPTManager...")
         from utils.chat_gpt_manager import ChatGPTManager
-        chat_manager = ChatGPTManager()
+        chat_manager = await asyncio.to_thread(ChatGPTManager)
         print("✅ ChatGPTManager inicializado")
         
         # Test 4: AnalizadorLRCompleto
         print("4. Probando AnalizadorLRCompleto...")
         from analizador_lr_completo import AnalizadorLRCompleto
-        analizador = AnalizadorLRCompleto()
+        analizador = await asyncio.to_thread(AnalizadorLRCompleto)
         print("✅ AnalizadorLRCompleto inicializado")
         
         return True
@@ -173,18 +176,19 @@ async def main():
         print("\n⚠️  Algunas variables no están configuradas")
         print("Las pruebas pueden fallar")
     
-    # Probar componentes
-    if not await test_componentes():
+    # Probar componentes y consulta en paralelo (no comparten estado)
+    ok_componentes, ok_consulta = await asyncio.gather(test_componentes(), test_consulta())
+    
+    if not ok_componentes:
         print("\n❌ Error en componentes básicos")
         sys.exit(1)
     
-    # Probar flujo mínimo
+    # Probar flujo mínimo (escribe en Pinecone: se ejecuta solo)
     if not await test_flujo_mini():
         print("\n❌ Error en flujo mínimo")
         sys.exit(1)
     
-    # Probar consulta
-    if not await test_consulta():
+    if not ok_consulta:
         print("\n❌ Error en consulta interactiva")
         sys.exit(1)
     
@@ -1,18 +1,41 @@
 import os
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import List
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 from dotenv import load_dotenv
-import requests
+import httpx
 
 load_dotenv()
 
-app = FastAPI(title="Test Feedback API", version="1.0.0")
-
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Crear un cliente HTTP compartido hacia Supabase durante la vida de la app."""
+    app.state.http = httpx.AsyncClient(
+        base_url=SUPABASE_URL,
+        headers={
+            "apikey": SUPABASE_KEY,
+            "Authorization": f"Bearer {SUPABASE_KEY}",
+            "Content-Type": "application/json"
+        }
+    )
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(
+    title="Test Feedback API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
 class FeedbackRequest(BaseModel):
     producto: str
     mercado: str
@@ -33,42 +56,40 @@ class FeedbackResponse(BaseModel):
 async def root():
     return {"message": "Test Feedback API is running!"}
 
-@app.post("/feedback/guardar_feedback/", response_model=FeedbackResponse)
+def _feedback_a_registro(feedback: FeedbackRequest, fecha: str) -> dict:
+    """Convertir un FeedbackRequest en el registro a insertar en Supabase."""
+    return {
+        "producto": feedback.producto,
+        "mercado": feedback.mercado,
+        "observacion": feedback.observacion,
+        "categoria": feedback.categoria,
+        "impacto": feedback.impacto,
+        "accion_recomendada": feedback.accion_recomendada,
+        "fuente": feedback.fuente,
+        "metadata": feedback.metadata,
+        "fecha": fecha,
+        "estado": "activo"
+    }
+
+@app.post("/feedback/guardar_feedback/", responses={200: {"model": FeedbackResponse}})
 async def guardar_feedback(feedback: FeedbackRequest):
     """
     Guarda feedback en Supabase usando la API REST
     """
     try:
-        # Preparar los datos para insertar
-        data = {
-            "producto": feedback.producto,
-            "mercado": feedback.mercado,
-            "observacion": feedback.observacion,
-            "categoria": feedback.categoria,
-            "impacto": feedback.impacto,
-            "accion_recomendada": feedback.accion_recomendada,
-            "fuente": feedback.fuente,
-            "metadata": feedback.metadata,
-            "fecha": datetime.now().isoformat(),
-            "estado": "activo"
-        }
+        timestamp = datetime.now().isoformat()
         
-        # URL de la API REST de Supabase para la tabla retroalimentacion
-        url = f"{SUPABASE_URL}/rest/v1/retroalimentacion"
-        
-        # Headers necesarios para Supabase
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-            "Prefer": "return=representation"
-        }
+        # Preparar los datos para insertar
+        data = _feedback_a_registro(feedback, timestamp)
         
         print(f"Enviando datos a Supabase: {data}")
-        print(f"URL: {url}")
         
-        # Hacer la petición POST a Supabase
-        response = requests.post(url, json=data, headers=headers)
+        # Hacer la petición POST a la API REST de Supabase (tabla retroalimentacion)
+        response = await app.state.http.post(
+            "/rest/v1/retroalimentacion",
+            json=data,
+            headers={"Prefer": "return=representation"}
+        )
         
         print(f"Respuesta de Supabase: {response.status_code}")
         print(f"Contenido: {response.text}")
@@ -81,18 +102,59 @@ async def guardar_feedback(feedback: FeedbackRequest):
             else:
                 inserted_id = 'unknown'
                 
-            return FeedbackResponse(
-                id=str(inserted_id),
-                status="success",
-                mensaje="Feedback guardado exitosamente",
-                timestamp=datetime.now().isoformat()
+            # Datos generados por el servidor: se devuelven sin validar con Pydantic
+            return ORJSONResponse({
+                "id": str(inserted_id),
+                "status": "success",
+                "mensaje": "Feedback guardado exitosamente",
+                "timestamp": timestamp
+            })
+        else:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Error al guardar en Supabase: {response.text}"
             )
+            
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error interno del servidor: {str(e)}"
+        )
+
+@app.post("/feedback/guardar_batch/")
+async def guardar_batch(items: List[FeedbackRequest]):
+    """
+    Guarda varios feedbacks en Supabase con una sola inserción (array JSON)
+    """
+    try:
+        # Un único timestamp para todo el lote
+        timestamp = datetime.now().isoformat()
+        data = [_feedback_a_registro(feedback, timestamp) for feedback in items]
+        
+        # PostgREST inserta el array completo en una sola sentencia
+        response = await app.state.http.post(
+            "/rest/v1/retroalimentacion",
+            json=data,
+            headers={"Prefer": "return=representation"}
+        )
+        
+        if response.status_code == 201:
+            ids = [str(record.get('id', 'unknown')) for record in response.json()]
+            return {
+                "ids": ids,
+                "status": "success",
+                "mensaje": f"{len(ids)} feedbacks guardados exitosamente",
+                "timestamp": timestamp
+            }
         else:
             raise HTTPException(
                 status_code=response.status_code,
                 detail=f"Error al guardar en Supabase: {response.text}"
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error: {str(e)}")
         raise HTTPException(
@@ -106,23 +168,37 @@ async def obtener_feedback():
     Obtiene todos los registros de feedback desde Supabase
     """
     try:
-        url = f"{SUPABASE_URL}/rest/v1/retroalimentacion?select=*&order=fecha.desc"
-        
-        headers = {
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}"
-        }
-        
-        response = requests.get(url, headers=headers)
+        request = app.state.http.build_request(
+            "GET",
+            "/rest/v1/retroalimentacion",
+            params={"select": "*", "order": "fecha.desc"}
+        )
+        response = await app.state.http.send(request, stream=True)
         
         if response.status_code == 200:
-            return {"data": response.json()}
+            # Reenviar el JSON de Supabase tal cual, sin decodificar ni re-serializar
+            async def cuerpo():
+                yield b'{"data":'
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+                yield b'}'
+            
+            # La respuesta upstream se cierra al terminar el envío, también si el cliente corta
+            return StreamingResponse(
+                cuerpo(),
+                media_type="application/json",
+                background=BackgroundTask(response.aclose)
+            )
         else:
+            await response.aread()
+            await response.aclose()
             raise HTTPException(
                 status_code=response.status_code,
                 detail=f"Error al obtener datos: {response.text}"
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -142,5 +218,10 @@ if __name__ == "__main__":
         except (ValueError, IndexError):
             pass
     
+    # uvloop/httptools cuando están instalados (uvloop no existe en Windows)
+    import importlib.util
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+    http = "httptools" if importlib.util.find_spec("httptools") else "auto"
+    
     print(f"Iniciando servidor en puerto {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port, loop=loop, http=http) 
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la exportación/backup en Parquet de SupabaseManager.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("dotenv")
+
+from supabase_client import SupabaseManager
+
+def _manager_con_paginas(paginas):
+    """SupabaseManager sin conexión cuyo iter_pages entrega las páginas dadas."""
+    manager = SupabaseManager.__new__(SupabaseManager)
+    
+    def iter_pages(page_size=1000):
+        for pagina in paginas:
+            if isinstance(pagina, Exception):
+                raise pagina
+            yield pagina
+    
+    manager.iter_pages = iter_pages
+    return manager
+
+def test_parquet_columna_nula_en_primera_pagina(tmp_path):
+    """Una columna toda nula en la página 1 acepta valores en la página 2."""
+    paginas = [
+        [
+            {'id': 1, 'fuente': 'a', 'precio_gpt': None, 'condiciones_comerciales': None, 'analizado_gpt': False},
+            {'id': 2, 'fuente': 'b', 'precio_gpt': None, 'condiciones_comerciales': None, 'analizado_gpt': None},
+        ],
+        [
+            {'id': 3, 'fuente': 'c', 'precio_gpt': '$100', 'condiciones_comerciales': {'pago': 'mensual'}, 'analizado_gpt': True},
+        ],
+    ]
+    filename = str(tmp_path / "backup.parquet")
+    
+    manager = _manager_con_paginas(paginas)
+    assert manager.export_data('parquet', filename) == filename
+    
+    filas = list(manager._iter_backup_rows(filename))
+    assert filas == [fila for pagina in paginas for fila in pagina]
+
+def test_parquet_sin_archivo_parcial_si_falla(tmp_path):
+    """Si falla una página no queda un .parquet truncado y se devuelve ''."""
+    paginas = [
+        [{'id': 1, 'fuente': 'a'}],
+        RuntimeError("error de red"),
+    ]
+    filename = tmp_path / "backup.parquet"
+    
+    manager = _manager_con_paginas(paginas)
+    assert manager.export_data('parquet', str(filename)) == ""
+    assert not filename.exists()
+
+def test_parquet_tabla_vacia(tmp_path):
+    """Una tabla vacía produce un archivo válido sin filas."""
+    filename = tmp_path / "backup.parquet"
+    
+    manager = _manager_con_paginas([])
+    assert manager.export_data('parquet', str(filename)) == str(filename)
+    assert filename.exists()
+    assert list(manager._iter_backup_rows(str(filename))) == []
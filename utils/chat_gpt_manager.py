@@ -9,13 +9,41 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 import asyncio
 
-import openai
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage, SystemMessage
-from langchain.prompts import ChatPromptTemplate
+try:
+    from async_lru import alru_cache
+    ASYNC_LRU_AVAILABLE = True
+except ImportError:
+    ASYNC_LRU_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Metadata vacía compartida para resultados sin metadata (no mutar)
+_EMPTY: dict = {}
+
+# Caché de respuestas de chat para consultas idénticas
+CHAT_CACHE_SIZE = 512
+CHAT_CACHE_TTL = 3600  # segundos
+
+# Confianza mínima (%) del mejor resultado para consultar a GPT
+MIN_CONTEXT_CONFIDENCE = 30
+
+# Plantilla fija del prompt de análisis; solo se rellenan la consulta y el contexto
+ANALYSIS_PROMPT_TEMPLATE = """
+Consulta del usuario: {query}
+
+Datos disponibles de proveedores LATAM:
+{context}
+
+Por favor analiza esta información y proporciona:
+1. Resumen de precios y servicios encontrados
+2. Comparación entre proveedores (si aplica)
+3. Recomendaciones específicas para el mercado LATAM
+4. Consideraciones importantes sobre confianza de datos
+5. Oportunidades o tendencias identificadas
+
+Responde de manera estructurada y profesional en español.
+"""
+
 class ChatGPTManager:
     """
     Gestor para chat con GPT usando datos de Pinecone.
@@ -35,15 +63,22 @@ class ChatGPTManager:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY no configurada")
         
-        # Configurar OpenAI
-        openai.api_key = self.api_key
+        # Importación diferida: openai solo se carga al crear el gestor
+        import openai
         
-        # Inicializar LangChain
-        self.llm = ChatOpenAI(
-            openai_api_key=self.api_key,
-            model_name=self.model,
-            temperature=0.3
-        )
+        # Cliente asíncrono de OpenAI (una sola completion por consulta)
+        self.client = openai.AsyncOpenAI(api_key=self.api_key)
+        
+        # El prompt del sistema es constante: construirlo una sola vez
+        self._system_prompt = self.create_system_prompt()
+        self._system_msg = {"role": "system", "content": self._system_prompt}
+        
+        # Caché LRU por instancia de (consulta, filtros, índice, versión del índice)
+        self._chat_cache = None
+        if ASYNC_LRU_AVAILABLE:
+            self._chat_cache = alru_cache(maxsize=CHAT_CACHE_SIZE, ttl=CHAT_CACHE_TTL)(
+                self._chat_with_context_cached
+            )
         
         logger.info(f"✅ ChatGPTManager inicializado - Modelo: {self.model}")
     
@@ -69,6 +104,26 @@ Información disponible:
 
 Responde siempre en español y proporciona información específica y accionable."""
     
+    async def _generate(self, prompt: str) -> str:
+        """
+        Generar una respuesta de GPT con el prompt del sistema precalculado.
+        
+        Args:
+            prompt: Prompt del usuario
+            
+        Returns:
+            Texto de la respuesta
+        """
+        resp = await self.client.chat.completions.create(
+            model=self.model,
+            temperature=0.3,
+            messages=[
+                self._system_msg,
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return resp.choices[0].message.content
+    
     def create_analysis_prompt(self, query: str, context_data: List[Dict[str, Any]]) -> str:
         """
         Crear prompt para análisis específico.
@@ -81,34 +136,22 @@ Responde siempre en español y proporciona información específica y accionable
             Prompt formateado
         """
         # Formatear datos de contexto
-        context_text = ""
+        parts = []
         for i, data in enumerate(context_data[:5]):  # Usar solo los 5 más relevantes
-            metadata = data.get('metadata', {})
-            context_text += f"\n--- Fuente {i+1} ---\n"
-            context_text += f"Proveedor: {metadata.get('proveedor', 'N/A')}\n"
-            context_text += f"País: {metadata.get('pais', 'N/A')}\n"
-            context_text += f"Módulo: {metadata.get('modulo', 'N/A')}\n"
-            context_text += f"Precio: {metadata.get('precio', 'N/A')}\n"
-            context_text += f"Moneda: {metadata.get('moneda', 'N/A')}\n"
-            context_text += f"Confianza: {metadata.get('confianza', 0)}%\n"
-            context_text += f"Texto: {metadata.get('texto', 'N/A')[:300]}...\n"
+            metadata = data.get('metadata') or _EMPTY
+            parts.append(
+                f"\n--- Fuente {i+1} ---\n"
+                f"Proveedor: {metadata.get('proveedor', 'N/A')}\n"
+                f"País: {metadata.get('pais', 'N/A')}\n"
+                f"Módulo: {metadata.get('modulo', 'N/A')}\n"
+                f"Precio: {metadata.get('precio', 'N/A')}\n"
+                f"Moneda: {metadata.get('moneda', 'N/A')}\n"
+                f"Confianza: {metadata.get('confianza', 0)}%\n"
+                f"Texto: {metadata.get('texto', 'N/A')[:300]}...\n"
+            )
+        context_text = "".join(parts)
         
-        prompt = f"""
-Consulta del usuario: {query}
-
-Datos disponibles de proveedores LATAM:
-{context_text}
-
-Por favor analiza esta información y proporciona:
-1. Resumen de precios y servicios encontrados
-2. Comparación entre proveedores (si aplica)
-3. Recomendaciones específicas para el mercado LATAM
-4. Consideraciones importantes sobre confianza de datos
-5. Oportunidades o tendencias identificadas
-
-Responde de manera estructurada y profesional en español.
-"""
-        return prompt
+        return ANALYSIS_PROMPT_TEMPLATE.format(query=query, context=context_text)
     
     async def chat_with_context(self, 
                                query: str, 
@@ -117,17 +160,73 @@ Responde de manera estructurada y profesional en español.
         """
         Chat con GPT usando contexto de Pinecone.
         
+        Las respuestas exitosas se guardan en caché mientras el índice no
+        cambie (ver ``PineconeManager.version``).
+        
         Args:
             query: Consulta del usuario
             pinecone_manager: Instancia del gestor de Pinecone
             filters: Filtros para la búsqueda (ej: {'pais': 'México'})
             
+        Returns:
+            Respuesta estructurada de GPT
+        """
+        if self._chat_cache is None:
+            return await self._chat_with_context(query, pinecone_manager, filters)
+        
+        filters_key = tuple(sorted(filters.items())) if filters else ()
+        version = getattr(pinecone_manager, 'version', 0)
+        try:
+            hash(filters_key)
+        except TypeError:
+            # Filtros no hashables: consultar sin caché
+            return await self._chat_with_context(query, pinecone_manager, filters)
+        
+        result = await self._chat_cache(query, filters_key, pinecone_manager, version)
+        if not result.get('success'):
+            # No conservar errores ni búsquedas vacías
+            self._chat_cache.cache_invalidate(query, filters_key, pinecone_manager, version)
+        return dict(result)
+    
+    async def _chat_with_context_cached(self, 
+                                       query: str, 
+                                       filters_key: tuple, 
+                                       pinecone_manager, 
+                                       version: int) -> Dict[str, Any]:
+        """
+        Variante con argumentos hashables para la caché LRU.
+        
+        Args:
+            query: Consulta del usuario
+            filters_key: Filtros como tupla ordenada de pares
+            pinecone_manager: Instancia del gestor de Pinecone
+            version: Versión del índice (invalida la caché tras escrituras)
+            
+        Returns:
+            Respuesta estructurada de GPT
+        """
+        return await self._chat_with_context(query, pinecone_manager, dict(filters_key) or None)
+    
+    async def _chat_with_context(self, 
+                                query: str, 
+                                pinecone_manager, 
+                                filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Ejecutar la búsqueda en Pinecone y la consulta a GPT sin caché.
+        
+        Args:
+            query: Consulta del usuario
+            pinecone_manager: Instancia del gestor de Pinecone
+            filters: Filtros para la búsqueda
+            
         Returns:
             Respuesta estructurada de GPT
         """
         try:
             # Buscar datos relevantes en Pinecone
-            context_data = pinecone_manager.search_similar(query, filters, top_k=10)
+            context_data = await asyncio.to_thread(
+                pinecone_manager.search_similar, query, filters, top_k=10
+            )
             
             if not context_data:
                 return {
@@ -140,20 +239,26 @@ Responde de manera estructurada y profesional en español.
                     ]
                 }
             
+            # Evitar la llamada a GPT si ningún resultado es suficientemente confiable
+            max_conf = max(((data.get('metadata') or _EMPTY).get('confianza', 0) or 0) for data in context_data)
+            if max_conf < MIN_CONTEXT_CONFIDENCE:
+                logger.info(f"⚠️ Contexto con baja confianza ({max_conf}%) - se omite GPT")
+                return {
+                    'success': False,
+                    'message': 'Los datos encontrados no son lo bastante confiables para responder tu consulta.',
+                    'max_confidence': max_conf,
+                    'suggestions': [
+                        'Reformula la consulta con el nombre del proveedor o módulo',
+                        'Especifica un país o módulo',
+                        'Verifica que los datos estén disponibles'
+                    ]
+                }
+            
             # Crear prompt
-            system_prompt = self.create_system_prompt()
             analysis_prompt = self.create_analysis_prompt(query, context_data)
             
             # Generar respuesta con GPT
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=analysis_prompt)
-            ]
-            
-            response = await self.llm.agenerate([messages])
-            
-            # Extraer respuesta
-            gpt_response = response.generations[0][0].text
+            gpt_response = await self._generate(analysis_prompt)
             
             # Estructurar respuesta
             result = {
@@ -168,24 +273,26 @@ Responde de manera estructurada y profesional en español.
             
             # Agregar estadísticas de contexto
             if context_data:
-                countries = set()
-                providers = set()
-                modules = set()
+                countries, providers, modules = set(), set(), set()
+                conf_sum = 0
                 
+                # Un solo recorrido para conjuntos y suma de confianza
                 for data in context_data:
-                    metadata = data.get('metadata', {})
+                    metadata = data.get('metadata') or _EMPTY
                     if metadata.get('pais'):
                         countries.add(metadata['pais'])
                     if metadata.get('proveedor'):
                         providers.add(metadata['proveedor'])
                     if metadata.get('modulo'):
                         modules.add(metadata['modulo'])
+                    conf_sum += metadata.get('confianza', 0) or 0
                 
+                n = len(context_data)
                 result['context_stats'] = {
                     'countries_found': list(countries),
                     'providers_found': list(providers),
                     'modules_found': list(modules),
-                    'avg_confidence': sum(data.get('metadata', {}).get('confianza', 0) for data in context_data) / len(context_data)
+                    'avg_confidence': conf_sum / n if n else 0
                 }
             
             logger.info(f"✅ Chat completado - Fuentes: {len(context_data)}")
@@ -221,19 +328,32 @@ Responde de manera estructurada y profesional en español.
                 from .pinecone_manager import get_pinecone_manager
                 pinecone_manager = get_pinecone_manager()
             
-            # Buscar datos de cada proveedor
-            all_data = []
+            # Buscar datos de cada proveedor en paralelo
+            tasks = []
             for provider in providers:
                 filters = {'proveedor': provider, 'modulo': module}
                 if country:
                     filters['pais'] = country
                 
-                provider_data = pinecone_manager.search_similar(
+                tasks.append(asyncio.to_thread(
+                    pinecone_manager.search_similar,
                     f"{module} pricing {provider}", 
                     filters, 
-                    top_k=5
-                )
-                all_data.extend(provider_data)
+                    5
+                ))
+            
+            results = await asyncio.gather(*tasks)
+            
+            # Eliminar vectores repetidos entre proveedores (mismo id)
+            all_data = []
+            seen = set()
+            for provider_data in results:
+                for data in provider_data:
+                    key = data.get('id') or id(data)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    all_data.append(data)
             
             if not all_data:
                 return {
@@ -242,20 +362,20 @@ Responde de manera estructurada y profesional en español.
                 }
             
             # Crear prompt de comparación
-            comparison_prompt = f"""
+            parts = [f"""
 Compara los siguientes proveedores para el módulo {module}:
 {', '.join(providers)}
 
 Datos disponibles:
-"""
+"""]
             
             for data in all_data:
-                metadata = data.get('metadata', {})
-                comparison_prompt += f"""
+                metadata = data.get('metadata') or _EMPTY
+                parts.append(f"""
 - {metadata.get('proveedor', 'N/A')}: {metadata.get('precio', 'N/A')} ({metadata.get('moneda', 'N/A')}) - Confianza: {metadata.get('confianza', 0)}%
-"""
+""")
             
-            comparison_prompt += f"""
+            parts.append("""
 
 Proporciona un análisis comparativo que incluya:
 1. Comparación de precios y costos
@@ -265,16 +385,11 @@ Proporciona un análisis comparativo que incluya:
 5. Factores de riesgo y confianza
 
 Responde en español de manera estructurada.
-"""
+""")
+            comparison_prompt = "".join(parts)
             
             # Generar respuesta
-            messages = [
-                SystemMessage(content=self.create_system_prompt()),
-                HumanMessage(content=comparison_prompt)
-            ]
-            
-            response = await self.llm.agenerate([messages])
-            gpt_response = response.generations[0][0].text
+            gpt_response = await self._generate(comparison_prompt)
             
             return {
                 'success': True,
@@ -314,9 +429,6 @@ Responde en español de manera estructurada.
                 from .pinecone_manager import get_pinecone_manager
                 pinecone_manager = get_pinecone_manager()
             
-            # Obtener estadísticas
-            stats = pinecone_manager.get_statistics()
-            
             # Buscar datos relevantes
             query = "market trends pricing analysis"
             filters = {}
@@ -325,10 +437,14 @@ Responde en español de manera estructurada.
             if module:
                 filters['modulo'] = module
             
-            context_data = pinecone_manager.search_similar(query, filters, top_k=15)
+            # Obtener estadísticas y datos en hilos, sin bloquear el event loop
+            stats, context_data = await asyncio.gather(
+                asyncio.to_thread(pinecone_manager.get_statistics),
+                asyncio.to_thread(pinecone_manager.search_similar, query, filters, top_k=15)
+            )
             
             # Crear prompt de insights
-            insights_prompt = f"""
+            parts = [f"""
 Analiza los siguientes datos del mercado de servicios financieros y crypto:
 
 Estadísticas generales:
@@ -337,15 +453,15 @@ Estadísticas generales:
 - Distribución por módulo: {stats.get('module_distribution', {})}
 
 Datos específicos:
-"""
+"""]
             
             for i, data in enumerate(context_data[:10]):
-                metadata = data.get('metadata', {})
-                insights_prompt += f"""
+                metadata = data.get('metadata') or _EMPTY
+                parts.append(f"""
 {i+1}. {metadata.get('proveedor', 'N/A')} - {metadata.get('modulo', 'N/A')} - {metadata.get('pais', 'N/A')} - {metadata.get('precio', 'N/A')}
-"""
+""")
             
-            insights_prompt += f"""
+            parts.append("""
 
 Proporciona insights sobre:
 1. Tendencias de precios en el mercado
@@ -355,16 +471,11 @@ Proporciona insights sobre:
 5. Recomendaciones estratégicas para LATAM
 
 Responde en español de manera profesional y estructurada.
-"""
+""")
+            insights_prompt = "".join(parts)
             
             # Generar respuesta
-            messages = [
-                SystemMessage(content=self.create_system_prompt()),
-                HumanMessage(content=insights_prompt)
-            ]
-            
-            response = await self.llm.agenerate([messages])
-            gpt_response = response.generations[0][0].text
+            gpt_response = await self._generate(insights_prompt)
             
             return {
                 'success': True,
@@ -4,14 +4,41 @@ Optimiza el análisis de textos usando modelos locales y distribuidos.
 """
 
 import os
+import re
 import json
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import torch
 import numpy as np
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable, Iterator
 from pathlib import Path
 from datetime import datetime
 import logging
 
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import intel_extension_for_pytorch as ipex
+    IPEX_AVAILABLE = True
+except ImportError:
+    IPEX_AVAILABLE = False
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTModelForSequenceClassification
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Hugging Face imports
 from transformers import (
     AutoTokenizer, 
@@ -28,18 +55,74 @@ import accelerate
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Longitudes de padding fijas con torch.compile: pocas formas de entrada posibles,
+# así el grafo compilado se reutiliza en lugar de recompilarse en cada llamada
+TOKEN_BUCKETS = (128, 256, 512)
+
+# Palabras clave de _contains_price_info (sobre texto en minúsculas)
+_PRICE_INFO_KEYWORDS = ("$", "€", "usd", "eur", "price", "cost", "fee", "monthly", "setup")
+
+# Patrones de precio de _extract_price_from_chunks (en orden de prioridad), unidos
+# en una alternancia: el grupo i + 1 corresponde al patrón i
+_CHUNK_PRICE_PATTERNS = (
+    r'\$[\d,]+(?:\.\d{2})?',
+    r'€[\d,]+(?:\.\d{2})?',
+    r'[\d,]+(?:\.\d{2})?\s*(?:USD|EUR|GBP)',
+    r'[\d,]+(?:\.\d{2})?\s*(?:dollars?|euros?|pounds?)'
+)
+_CHUNK_PRICE_RE = re.compile('|'.join(f'({p})' for p in _CHUNK_PRICE_PATTERNS), re.IGNORECASE)
+
+# Todos los patrones exigen al menos un carácter de [\d,]: sin ellos no hay precio
+_CHUNK_PRICE_CHAR_RE = re.compile(r'[\d,]')
+
+# Tareas cuyo resultado se calcula sobre el texto sin usar la salida del modelo
+TEXT_ONLY_TASKS = ("classification", "summarization")
+
+# Clasificación de módulos basada en palabras clave (sobre texto en minúsculas)
+_CLASSIFICATION_KEYWORDS = {
+    "Wallet Base": ("wallet", "crypto", "digital currency"),
+    "KYC/KYB": ("kyc", "kyb", "verification", "identity", "compliance"),
+    "Trading Platform": ("trading", "exchange", "broker", "market"),
+    "Payment Gateway": ("payment", "gateway", "transaction", "processing"),
+    "White Label Solution": ("white label", "whitelabel", "customizable")
+}
+
+_CLASSIFICATION_MODULES = list(_CLASSIFICATION_KEYWORDS)
+_CLASSIFICATION_MODULES_ARRAY = np.array(_CLASSIFICATION_MODULES, dtype=object)
+_CLASSIFICATION_KEYWORD_COUNTS = np.array([len(keywords) for keywords in _CLASSIFICATION_KEYWORDS.values()])
+
+# Autómata con todas las palabras clave: una sola pasada por texto en lugar de
+# una búsqueda por palabra clave
+if AHOCORASICK_AVAILABLE:
+    _CLASSIFICATION_AUTOMATON = ahocorasick.Automaton()
+    for _keywords in _CLASSIFICATION_KEYWORDS.values():
+        for _keyword in _keywords:
+            _CLASSIFICATION_AUTOMATON.add_word(_keyword, _keyword)
+    _CLASSIFICATION_AUTOMATON.make_automaton()
+    del _keywords, _keyword
+
 class ModelManager:
     """
     Gestor de modelos que utiliza Hugging Face Transformers y Safetensors
     para optimizar el análisis de textos extraídos.
     """
     
-    def __init__(self, model_cache_dir: str = "./models_cache"):
+    def __init__(self, model_cache_dir: str = "./models_cache", use_compile: Optional[bool] = None,
+                 quantize_cpu: Optional[bool] = None, use_cuda_graphs: Optional[bool] = None,
+                 backend: Optional[str] = None):
         """
         Inicializar el gestor de modelos.
         
         Args:
             model_cache_dir: Directorio para cachear modelos
+            use_compile: Compilar los modelos con torch.compile en GPU
+                (por defecto, variable de entorno MODEL_USE_COMPILE)
+            quantize_cpu: Cuantizar dinámicamente a int8 las capas Linear en CPU
+                (por defecto, variable de entorno MODEL_QUANTIZE_CPU)
+            use_cuda_graphs: Capturar el forward de embeddings en CUDA Graphs
+                (por defecto, variable de entorno MODEL_USE_CUDA_GRAPHS)
+            backend: "torch" u "ort" (ONNX Runtime para clasificación y embeddings)
+                (por defecto, variable de entorno MODEL_BACKEND)
         """
         self.model_cache_dir = Path(model_cache_dir)
         self.model_cache_dir.mkdir(exist_ok=True)
@@ -48,8 +131,58 @@ class ModelManager:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         logger.info(f"Using device: {self.device}")
         
+        # Precisión en GPU: bf16 en Ampere o superior (mismo rango que fp32, sin
+        # overflow en logits/softmax), fp16 en GPUs anteriores; fp32 en CPU
+        if self.device.type == "cuda":
+            bf16_supported = torch.cuda.get_device_capability()[0] >= 8
+            self.torch_dtype = torch.bfloat16 if bf16_supported else torch.float16
+        else:
+            self.torch_dtype = torch.float32
+        
+        # Matmul fp32 con TF32 en Ampere y kernels GEMM más rápidos en CPU (oneDNN)
+        if hasattr(torch, "set_float32_matmul_precision"):
+            torch.set_float32_matmul_precision('high')
+        
+        # Backend de inferencia: ONNX Runtime ejecuta el grafo exportado sin pasar por
+        # Python en cada operación; requiere optimum[onnxruntime]
+        backend = (backend or os.getenv('MODEL_BACKEND', 'torch')).lower()
+        if backend == "ort" and not ORT_AVAILABLE:
+            logger.warning("optimum[onnxruntime] not installed; falling back to the torch backend")
+            backend = "torch"
+        self.backend = backend
+        
+        # torch.compile reduce el overhead por llamada, pero la primera inferencia
+        # de cada modelo paga la compilación (~1 min): desactivado salvo que se pida
+        if use_compile is None:
+            use_compile = os.getenv('MODEL_USE_COMPILE', 'false').lower() == 'true'
+        self.use_compile = use_compile and hasattr(torch, "compile")
+        
+        # int8 dinámico en CPU: ~4x menos memoria en pesos Linear y kernels FBGEMM,
+        # a costa de una pequeña diferencia numérica en los embeddings
+        if quantize_cpu is None:
+            quantize_cpu = os.getenv('MODEL_QUANTIZE_CPU', 'false').lower() == 'true'
+        self.quantize_cpu = quantize_cpu
+        
+        # Intel Extension for PyTorch en CPU (bf16 vía AVX-512/AMX), si está instalada;
+        # la cuantización int8 tiene prioridad sobre esta vía
+        self.use_ipex = IPEX_AVAILABLE and self.device.type == "cpu" and not self.quantize_cpu
+        
+        # CUDA Graphs para embeddings: se reproducen los kernels capturados sin overhead
+        # de Python/driver. Con torch.compile no hace falta (reduce-overhead ya los usa)
+        if use_cuda_graphs is None:
+            use_cuda_graphs = os.getenv('MODEL_USE_CUDA_GRAPHS', 'false').lower() == 'true'
+        self.use_cuda_graphs = (use_cuda_graphs and self.device.type == "cuda"
+                                and not self.use_compile and self.backend == "torch")
+        # Grafos capturados por (tarea, batch, longitud): (grafo, entradas estáticas, salida estática)
+        self._graphs = {}
+        
+        # Formas de entrada fijas (buckets de padding) para compilación o grafos en GPU
+        self._static_shapes = self.device.type == "cuda" and (self.use_compile or self.use_cuda_graphs)
+        
         # Modelos cargados
         self.loaded_models = {}
+        # Estadísticas de parámetros por tipo de modelo: (modelo, estadísticas)
+        self._model_stats = {}
         self.tokenizers = {}
         
         # Configurar accelerate para optimizaciones
@@ -100,7 +233,10 @@ class ModelManager:
             # Intentar cargar desde cache local primero
             cache_path = self.model_cache_dir / f"{model_name.replace('/', '_')}"
             
-            if cache_path.exists():
+            if self.backend == "ort" and model_type in ("classification", "embedding"):
+                logger.info(f"Loading ONNX Runtime model: {model_name}")
+                model = self._load_ort_model(model_name, model_type, cache_path)
+            elif cache_path.exists():
                 logger.info(f"Loading from cache: {cache_path}")
                 model = self._load_from_cache(cache_path, model_type)
             else:
@@ -114,6 +250,99 @@ class ModelManager:
             logger.error(f"Error loading model {model_name}: {str(e)}")
             raise
     
+    def warmup(self, tasks: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Cargar varios modelos en paralelo (descargas y lectura de disco solapadas).
+        
+        Con formas estáticas (torch.compile o CUDA Graphs en GPU) también se ejecuta
+        un forward por bucket de padding, de modo que la compilación o la captura se
+        paga aquí y no en la primera petición.
+        
+        Args:
+            tasks: Tipos de modelo a cargar (por defecto, todos los configurados)
+            
+        Returns:
+            Diccionario tipo de modelo -> True si quedó cargado
+        """
+        tasks = list(tasks or self.model_configs)
+        if not tasks:
+            return {}
+        
+        # from_pretrained libera el GIL durante la red y la E/S: los hilos se solapan
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {task: executor.submit(self.load_model, task) for task in tasks}
+        
+        results = {}
+        for task, future in futures.items():
+            try:
+                results[task] = future.result() is not None
+            except Exception as e:
+                logger.warning(f"Warmup failed for {task}: {str(e)}")
+                results[task] = False
+        
+        if self._static_shapes:
+            for task, loaded in results.items():
+                if loaded and task not in TEXT_ONLY_TASKS:
+                    self._warmup_forward(task)
+        
+        return results
+    
+    def _warmup_forward(self, task: str):
+        """
+        Ejecutar un forward de prueba por cada bucket de padding de una tarea.
+        
+        Args:
+            task: Tipo de modelo ya cargado
+        """
+        try:
+            model = self.loaded_models[task]
+            tokenizer = self.tokenizers[task]
+            max_length = self.model_configs[task].get("max_length", 512)
+            encoded = tokenizer("warmup", truncation=True, max_length=max_length)
+            
+            for bucket in sorted({self._bucketize(size, max_length) for size in TOKEN_BUCKETS}):
+                inputs = tokenizer.pad(
+                    encoded,
+                    padding="max_length",
+                    max_length=bucket,
+                    return_tensors="pt"
+                ).to(self.device)
+                with torch.inference_mode(), self._autocast():
+                    self._forward(task, model, inputs)
+            
+            logger.info(f"Warmup forward passes completed for {task}")
+        except Exception as e:
+            logger.warning(f"Warmup forward failed for {task}: {str(e)}")
+    
+    def _load_ort_model(self, model_name: str, model_type: str, cache_path: Path) -> Any:
+        """
+        Cargar un modelo ONNX Runtime, exportándolo y cacheándolo la primera vez.
+        
+        Args:
+            model_name: Nombre del modelo en el Hub
+            model_type: Tipo de modelo (classification o embedding)
+            cache_path: Directorio de cache del modelo
+            
+        Returns:
+            Modelo ORT; se llama con los mismos tensores tokenizados que el modelo torch
+        """
+        onnx_path = cache_path / "onnx"
+        ort_class = ORTModelForSequenceClassification if model_type == "classification" else ORTModelForFeatureExtraction
+        provider = "CUDAExecutionProvider" if self.device.type == "cuda" else "CPUExecutionProvider"
+        
+        if onnx_path.exists():
+            model = ort_class.from_pretrained(str(onnx_path), provider=provider)
+            tokenizer = AutoTokenizer.from_pretrained(str(onnx_path), use_fast=True)
+        else:
+            model = ort_class.from_pretrained(model_name, export=True, provider=provider)
+            tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+            onnx_path.mkdir(parents=True, exist_ok=True)
+            model.save_pretrained(str(onnx_path))
+            tokenizer.save_pretrained(str(onnx_path))
+        
+        self._register_tokenizer(tokenizer, model_type)
+        return model
+    
     def _load_from_cache(self, cache_path: Path, model_type: str) -> Any:
         """Cargar modelo desde cache local usando Safetensors."""
         try:
@@ -123,27 +352,13 @@ class ModelManager:
                 config = json.load(f)
             
             # Cargar tokenizer
-            tokenizer = AutoTokenizer.from_pretrained(str(cache_path))
-            self.tokenizers[model_type] = tokenizer
-            
-            # Cargar modelo según el tipo
-            if model_type == "classification":
-                model = AutoModelForSequenceClassification.from_pretrained(
-                    str(cache_path), 
-                    torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32
-                )
-            elif model_type == "embedding":
-                model = AutoModel.from_pretrained(
-                    str(cache_path),
-                    torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32
-                )
-            else:
-                model = AutoModel.from_pretrained(str(cache_path))
+            tokenizer = AutoTokenizer.from_pretrained(str(cache_path), use_fast=True)
+            self._register_tokenizer(tokenizer, model_type)
             
-            model.to(self.device)
-            model.eval()
+            # Cargar modelo según el tipo (el cache siempre se guarda en safetensors)
+            model = self._from_pretrained(str(cache_path), model_type, use_safetensors=True)
             
-            return model
+            return self._prepare_model(model)
             
         except Exception as e:
             logger.warning(f"Failed to load from cache: {str(e)}")
@@ -154,29 +369,105 @@ class ModelManager:
         cache_path.mkdir(exist_ok=True)
         
         # Descargar tokenizer
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
         tokenizer.save_pretrained(str(cache_path))
-        self.tokenizers[model_type] = tokenizer
+        self._register_tokenizer(tokenizer, model_type)
         
         # Descargar modelo
+        model = self._from_pretrained(model_name, model_type)
+        
+        # Guardar modelo usando Safetensors para optimización
+        model.save_pretrained(str(cache_path), safe_serialization=True)
+        
+        return self._prepare_model(model)
+    
+    def _register_tokenizer(self, tokenizer: Any, model_type: str):
+        """
+        Registrar el tokenizer de un tipo de modelo con su longitud máxima configurada.
+        
+        Args:
+            tokenizer: Tokenizer cargado con use_fast=True
+            model_type: Tipo de modelo al que pertenece
+        """
+        if not tokenizer.is_fast:
+            logger.warning(f"No fast tokenizer available for {model_type}; using the slow Python tokenizer")
+        
+        # Fijar la longitud máxima una sola vez en lugar de resolverla en cada llamada
+        max_length = self.model_configs.get(model_type, {}).get("max_length")
+        if max_length:
+            tokenizer.model_max_length = max_length
+        
+        self.tokenizers[model_type] = tokenizer
+    
+    def _from_pretrained(self, source: str, model_type: str, use_safetensors: Optional[bool] = None) -> Any:
+        """
+        Cargar pesos directamente en el device del gestor.
+        
+        Con low_cpu_mem_usage y device_map, transformers lee los safetensors por mmap
+        y coloca cada tensor en el device sin una copia completa previa en CPU.
+        
+        Args:
+            source: Ruta local o nombre del modelo en el Hub
+            model_type: Tipo de modelo (classification, embedding, summarization)
+            use_safetensors: Exigir pesos safetensors (mmap, sin pickle)
+            
+        Returns:
+            Modelo cargado en self.device
+        """
+        kwargs = {
+            "low_cpu_mem_usage": True,
+            "device_map": {"": str(self.device)},
+            "use_safetensors": use_safetensors
+        }
+        
         if model_type == "classification":
-            model = AutoModelForSequenceClassification.from_pretrained(
-                model_name,
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32
+            return AutoModelForSequenceClassification.from_pretrained(
+                source,
+                torch_dtype=self.torch_dtype,
+                **kwargs
             )
         elif model_type == "embedding":
-            model = AutoModel.from_pretrained(
-                model_name,
-                torch_dtype=torch.float16 if self.device.type == "cuda" else torch.float32
+            return AutoModel.from_pretrained(
+                source,
+                torch_dtype=self.torch_dtype,
+                **kwargs
             )
-        else:
-            model = AutoModel.from_pretrained(model_name)
-        
-        # Guardar modelo usando Safetensors para optimización
-        model.save_pretrained(str(cache_path), safe_serialization=True)
+        return AutoModel.from_pretrained(source, **kwargs)
+    
+    def _prepare_model(self, model: Any) -> Any:
+        """
+        Mover el modelo al device, ponerlo en modo evaluación y compilarlo si procede.
         
+        Args:
+            model: Modelo AutoModel* recién cargado
+            
+        Returns:
+            Modelo listo para inferencia (compilado si use_compile y hay GPU)
+        """
+        # No-op si los pesos ya se cargaron en el device (_from_pretrained)
         model.to(self.device)
         model.eval()
+        # Solo inferencia: sin metadata de autograd en los parámetros
+        model.requires_grad_(False)
+        
+        # Cuantización dinámica en CPU: los pesos de nn.Linear pasan a int8 y las
+        # activaciones se cuantizan al vuelo (los productos Q/K siguen en fp32)
+        if self.quantize_cpu and self.device.type == "cpu":
+            logger.info("Applying dynamic int8 quantization to Linear layers")
+            try:
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            except RuntimeError as e:
+                # Sin backend de cuantización (p. ej. ARM sin qnnpack): seguir en fp32
+                logger.warning(f"Dynamic quantization failed, keeping fp32 model: {str(e)}")
+        elif self.use_ipex:
+            logger.info("Optimizing model with Intel Extension for PyTorch (bf16)")
+            model = ipex.optimize(model, dtype=torch.bfloat16)
+        
+        # Se compila el modelo crudo (no un pipeline): la compilación ocurre en la
+        # primera llamada y el callable compilado queda en self.loaded_models
+        if self.use_compile and self.device.type == "cuda":
+            logger.info("Compiling model with torch.compile (reduce-overhead)")
+            model = torch.compile(model, mode="reduce-overhead", fullgraph=False)
         
         return model
     
@@ -192,6 +483,12 @@ class ModelManager:
             Resultado del análisis
         """
         try:
+            # Clasificación y resumen se calculan sobre el texto y no usan la salida del
+            # modelo: se omiten la carga, el tokenizado y el forward (el único encoder
+            # que se ejecuta en el camino local es el de embeddings)
+            if task in TEXT_ONLY_TASKS:
+                return self._process_text_only_output(task, text)
+            
             model = self.load_model(task)
             tokenizer = self.tokenizers.get(task)
             
@@ -199,49 +496,119 @@ class ModelManager:
                 raise ValueError(f"Model or tokenizer not loaded for task: {task}")
             
             # Tokenizar texto
-            inputs = tokenizer(
-                text,
-                truncation=True,
-                padding=True,
-                max_length=self.model_configs[task].get("max_length", 512),
-                return_tensors="pt"
-            ).to(self.device)
+            inputs = self._tokenize(tokenizer, text, self.model_configs[task].get("max_length", 512))
             
             # Inferencia
-            with torch.no_grad():
-                outputs = model(**inputs)
+            with torch.inference_mode(), self._autocast():
+                outputs = self._forward(task, model, inputs)
             
             # Procesar resultados según la tarea
-            if task == "classification":
-                return self._process_classification_output(outputs, text)
-            elif task == "embedding":
-                return self._process_embedding_output(outputs, text)
-            elif task == "summarization":
-                return self._process_summarization_output(outputs, text)
+            if task == "embedding":
+                return self._process_embedding_output(outputs, text, inputs.get("attention_mask"))
             
         except Exception as e:
             logger.error(f"Error in local model analysis: {str(e)}")
             return self._get_fallback_analysis()
     
+    def analyze_texts_with_local_model(self, texts: List[str], task: str = "classification",
+                                       batch_size: int = 16) -> List[Dict[str, Any]]:
+        """
+        Analizar varios textos con el modelo local, agrupándolos en lotes por forward.
+        
+        Args:
+            texts: Textos a analizar
+            task: Tipo de tarea (classification, embedding, summarization)
+            batch_size: Número de textos por forward del modelo
+            
+        Returns:
+            Lista de resultados del análisis, en el mismo orden que texts
+        """
+        try:
+            # Tareas que no usan la salida del modelo: sin carga, tokenizado ni forward
+            if task in TEXT_ONLY_TASKS:
+                return [self._process_text_only_output(task, text) for text in texts]
+            
+            model = self.load_model(task)
+            tokenizer = self.tokenizers.get(task)
+            
+            if not model or not tokenizer:
+                raise ValueError(f"Model or tokenizer not loaded for task: {task}")
+            
+            max_length = self.model_configs[task].get("max_length", 512)
+            results = []
+            
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+                
+                # Tokenizar e inferir el lote completo en un solo forward
+                inputs = self._tokenize(tokenizer, batch, max_length)
+                with torch.inference_mode(), self._autocast():
+                    outputs = self._forward(task, model, inputs)
+                
+                # Procesar resultados según la tarea
+                if task == "embedding":
+                    embeddings = self._mean_pool(outputs, inputs.get("attention_mask"))
+                    results.extend(
+                        {
+                            "embedding": embeddings[row:row + 1],
+                            "embedding_dim": embeddings.shape[1],
+                            "text_length": len(text)
+                        }
+                        for row, text in enumerate(batch)
+                    )
+                else:
+                    results.extend(None for _ in batch)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error in local model batch analysis: {str(e)}")
+            return [self._get_fallback_analysis() for _ in texts]
+    
+    def batch_analyze(self, texts: List[str], batch_size: int = 16) -> List[Dict[str, Any]]:
+        """
+        Clasificación, precio y embedding de varios textos con forwards por lotes.
+        
+        Args:
+            texts: Textos a analizar
+            batch_size: Número de textos por forward del modelo
+        
+        Returns:
+            Lista alineada con texts de diccionarios con las claves
+            classification, price y embedding
+        """
+        classifications = self.analyze_texts_with_local_model(texts, task="classification",
+                                                              batch_size=batch_size)
+        embeddings = self.analyze_texts_with_local_model(texts, task="embedding",
+                                                         batch_size=batch_size)
+        
+        return [
+            {
+                "classification": classification,
+                "price": self.extract_price_with_bert(text),
+                "embedding": embedding
+            }
+            for text, classification, embedding in zip(texts, classifications, embeddings)
+        ]
+    
+    def _process_text_only_output(self, task: str, text: str) -> Dict[str, Any]:
+        """Resultado de una tarea que se calcula solo a partir del texto."""
+        if task == "classification":
+            return self._process_classification_output(None, text)
+        return self._process_summarization_output(None, text)
+    
     def _process_classification_output(self, outputs, text: str) -> Dict[str, Any]:
         """Procesar salida de clasificación."""
         # Simular clasificación de módulos basada en el texto
         text_lower = text.lower()
         
-        # Clasificación basada en palabras clave
-        module_keywords = {
-            "Wallet Base": ["wallet", "crypto", "digital currency"],
-            "KYC/KYB": ["kyc", "kyb", "verification", "identity", "compliance"],
-            "Trading Platform": ["trading", "exchange", "broker", "market"],
-            "Payment Gateway": ["payment", "gateway", "transaction", "processing"],
-            "White Label Solution": ["white label", "whitelabel", "customizable"]
+        # Clasificación basada en palabras clave (cada palabra cuenta una vez)
+        hits = self._count_module_keywords(text_lower)
+        scores = {
+            module: count / len(keywords)
+            for (module, keywords), count in zip(_CLASSIFICATION_KEYWORDS.items(), hits)
         }
         
-        scores = {}
-        for module, keywords in module_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            scores[module] = score / len(keywords)
-        
         # Obtener la clasificación con mayor score
         best_module = max(scores.items(), key=lambda x: x[1])
         
@@ -251,13 +618,71 @@ class ModelManager:
             "scores": scores
         }
     
-    def _process_embedding_output(self, outputs, text: str) -> Dict[str, Any]:
+    def _count_module_keywords(self, text_lower: str) -> List[int]:
+        """Número de palabras clave distintas de cada módulo presentes en el texto."""
+        if AHOCORASICK_AVAILABLE:
+            found = {keyword for _, keyword in _CLASSIFICATION_AUTOMATON.iter(text_lower)}
+            return [len(found.intersection(keywords)) for keywords in _CLASSIFICATION_KEYWORDS.values()]
+        return [
+            sum(1 for keyword in keywords if keyword in text_lower)
+            for keywords in _CLASSIFICATION_KEYWORDS.values()
+        ]
+    
+    def classify_texts(self, texts: List[str]) -> Dict[str, Any]:
+        """
+        Clasificar varios textos por módulo con arrays NumPy (una fila por texto).
+        
+        Args:
+            texts: Textos a clasificar
+            
+        Returns:
+            Diccionario con arrays clasificacion_modulo, confianza_analisis y scores
+            (N textos x N módulos), y la lista de módulos de las columnas
+        """
+        hits = np.zeros((len(texts), len(_CLASSIFICATION_MODULES)), dtype=np.int32)
+        for row, text in enumerate(texts):
+            hits[row] = self._count_module_keywords(text.lower())
+        
+        # Mismo criterio que _process_classification_output, vectorizado por filas
+        scores = hits / _CLASSIFICATION_KEYWORD_COUNTS
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(texts)), best]
+        
+        return {
+            "clasificacion_modulo": np.where(best_scores > 0, _CLASSIFICATION_MODULES_ARRAY[best], "General Service"),
+            "confianza_analisis": np.where(best_scores > 0.5, "alta", "media"),
+            "scores": scores,
+            "modules": _CLASSIFICATION_MODULES
+        }
+    
+    def _mean_pool(self, outputs, attention_mask=None) -> np.ndarray:
+        """
+        Promediar el último hidden state por texto, ignorando tokens de padding.
+        
+        La reducción se acumula en float32 en el device (también con pesos bf16, que
+        NumPy no admite) y en GPU se copia a CPU como float16: la mitad de bytes.
+        """
+        hidden = outputs.last_hidden_state
+        if attention_mask is None:
+            pooled = hidden.mean(dim=1, dtype=torch.float32)
+        else:
+            # Con padding (lotes o buckets) solo cuentan los tokens reales de cada texto
+            mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+            summed = (hidden * mask).sum(dim=1, dtype=torch.float32)
+            pooled = summed / mask.sum(dim=1, dtype=torch.float32).clamp(min=1)
+        
+        if pooled.is_cuda:
+            pooled = pooled.to(torch.float16)
+        return pooled.cpu().numpy()
+    
+    def _process_embedding_output(self, outputs, text: str, attention_mask=None) -> Dict[str, Any]:
         """Procesar salida de embeddings."""
-        # Extraer embeddings del último hidden state
-        embeddings = outputs.last_hidden_state.mean(dim=1).cpu().numpy()
+        # Extraer embeddings del último hidden state (ndarray 1 x dim; .tolist() si se
+        # necesita una lista de Python, p. ej. para serializar a JSON)
+        embeddings = self._mean_pool(outputs, attention_mask)
         
         return {
-            "embedding": embeddings.tolist(),
+            "embedding": embeddings,
             "embedding_dim": embeddings.shape[1],
             "text_length": len(text)
         }
@@ -286,51 +711,142 @@ class ModelManager:
             Precio extraído o None
         """
         try:
-            # Usar modelo de clasificación para identificar secciones de precios
-            model = self.load_model("classification")
-            tokenizer = self.tokenizers.get("classification")
+            # Textos sin dígitos ni comas (títulos, menús, etc.) no pueden contener
+            # precio: se descartan sin trocearlos
+            if _CHUNK_PRICE_CHAR_RE.search(text) is None:
+                return None
             
-            # Dividir texto en chunks para análisis
+            # Dividir texto en chunks de forma perezosa: el recorrido se detiene en el
+            # primer chunk con precio en lugar de trocear todo el documento
             chunks = self._split_text_into_chunks(text, max_length=256)
             
-            price_chunks = []
-            for chunk in chunks:
-                # Clasificar si el chunk contiene información de precios
-                inputs = tokenizer(
-                    chunk,
-                    truncation=True,
-                    padding=True,
-                    return_tensors="pt"
-                ).to(self.device)
-                
-                with torch.no_grad():
-                    outputs = model(**inputs)
-                
-                # Si el chunk parece contener precios, agregarlo
-                if self._contains_price_info(chunk):
-                    price_chunks.append(chunk)
+            # Conservar los chunks que parecen contener precios (el forward del modelo
+            # no intervenía en la decisión: se omite junto con la carga del modelo)
+            price_chunks = (chunk for chunk in chunks if self._contains_price_info(chunk))
             
             # Extraer precio del chunk más relevante
-            if price_chunks:
-                return self._extract_price_from_chunks(price_chunks)
-            
-            return None
+            return self._extract_price_from_chunks(price_chunks)
             
         except Exception as e:
             logger.error(f"Error extracting price with BERT: {str(e)}")
             return None
     
-    def _split_text_into_chunks(self, text: str, max_length: int = 256) -> List[str]:
-        """Dividir texto en chunks para procesamiento."""
-        words = text.split()
-        chunks = []
+    def _autocast(self):
+        """Contexto de autocast para el forward (GPU, o CPU optimizada con IPEX en bf16)."""
+        if self.device.type == "cuda":
+            # La caché de casts de autocast no es compatible con la captura de grafos
+            return torch.autocast(device_type="cuda", dtype=self.torch_dtype,
+                                  cache_enabled=not self.use_cuda_graphs)
+        if self.use_ipex:
+            return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+    
+    def _forward(self, task: str, model: Any, inputs: Any) -> Any:
+        """
+        Ejecutar el forward del modelo, reproduciendo un CUDA Graph para embeddings.
+        
+        Args:
+            task: Tipo de tarea del modelo
+            model: Modelo cargado
+            inputs: Tensores de entrada (con padding a bucket si use_cuda_graphs)
+            
+        Returns:
+            Salida del modelo. Con CUDA Graphs es la salida estática del grafo, que se
+            sobrescribe en la siguiente llamada: debe consumirse antes de volver a llamar
+        """
+        if task != "embedding" or not self.use_cuda_graphs:
+            return model(**inputs)
+        
+        key = (task,) + tuple(inputs["input_ids"].shape)
+        graph = self._graphs.get(key)
+        
+        if graph is None:
+            static_inputs = {name: tensor.clone() for name, tensor in inputs.items()}
+            
+            # Calentamiento en un stream aparte antes de capturar (requisito de CUDA Graphs)
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    model(**static_inputs)
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            cuda_graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(cuda_graph):
+                static_outputs = model(**static_inputs)
+            
+            graph = (cuda_graph, static_inputs, static_outputs)
+            self._graphs[key] = graph
+            logger.info(f"Captured CUDA graph for {task} with input shape {key[1:]}")
+        
+        cuda_graph, static_inputs, static_outputs = graph
+        for name, tensor in static_inputs.items():
+            tensor.copy_(inputs[name])
+        cuda_graph.replay()
+        return static_outputs
+    
+    def _tokenize(self, tokenizer, text: Union[str, List[str]], max_length: int) -> Any:
+        """
+        Tokenizar texto con padding estable para modelos compilados o grafos CUDA.
+        
+        Args:
+            tokenizer: Tokenizer del modelo
+            text: Texto o lista de textos a tokenizar
+            max_length: Longitud máxima en tokens
+            
+        Returns:
+            Tensores de entrada en el device del gestor
+        """
+        if not self._static_shapes:
+            return tokenizer(
+                text,
+                truncation=True,
+                padding=True,
+                max_length=max_length,
+                return_tensors="pt"
+            ).to(self.device)
+        
+        # Con torch.compile o CUDA Graphs: tokenizar sin padding y rellenar hasta el bucket que cabe
+        encoded = tokenizer(text, truncation=True, max_length=max_length)
+        input_ids = encoded["input_ids"]
+        if isinstance(text, str):
+            length = len(input_ids)
+        else:
+            length = max((len(ids) for ids in input_ids), default=0)
+        
+        return tokenizer.pad(
+            encoded,
+            padding="max_length",
+            max_length=self._bucketize(length, max_length),
+            return_tensors="pt"
+        ).to(self.device)
+    
+    @staticmethod
+    def _bucketize(length: int, max_length: int) -> int:
+        """
+        Obtener el bucket de padding más pequeño que admite una longitud.
+        
+        Args:
+            length: Longitud en tokens de la entrada
+            max_length: Longitud máxima permitida
+            
+        Returns:
+            Longitud de padding (bucket de TOKEN_BUCKETS o max_length)
+        """
+        for bucket in TOKEN_BUCKETS:
+            if length <= bucket <= max_length:
+                return bucket
+        return max_length
+    
+    def _split_text_into_chunks(self, text: str, max_length: int = 256) -> Iterator[str]:
+        """Dividir texto en chunks para procesamiento (generados de forma perezosa)."""
         current_chunk = []
         current_length = 0
         
-        for word in words:
+        for word in text.split():
             if current_length + len(word) + 1 > max_length:
                 if current_chunk:
-                    chunks.append(" ".join(current_chunk))
+                    yield " ".join(current_chunk)
                 current_chunk = [word]
                 current_length = len(word)
             else:
@@ -338,33 +854,27 @@ class ModelManager:
                 current_length += len(word) + 1
         
         if current_chunk:
-            chunks.append(" ".join(current_chunk))
-        
-        return chunks
+            yield " ".join(current_chunk)
     
     def _contains_price_info(self, text: str) -> bool:
         """Verificar si el texto contiene información de precios."""
-        price_keywords = ["$", "€", "USD", "EUR", "price", "cost", "fee", "monthly", "setup"]
         text_lower = text.lower()
-        return any(keyword in text_lower for keyword in price_keywords)
+        return any(keyword in text_lower for keyword in _PRICE_INFO_KEYWORDS)
     
-    def _extract_price_from_chunks(self, chunks: List[str]) -> Optional[str]:
+    def _extract_price_from_chunks(self, chunks: Iterable[str]) -> Optional[str]:
         """Extraer precio de los chunks identificados."""
-        import re
-        
         for chunk in chunks:
-            # Patrones de precios
-            price_patterns = [
-                r'\$[\d,]+(?:\.\d{2})?',
-                r'€[\d,]+(?:\.\d{2})?',
-                r'[\d,]+(?:\.\d{2})?\s*(?:USD|EUR|GBP)',
-                r'[\d,]+(?:\.\d{2})?\s*(?:dollars?|euros?|pounds?)'
-            ]
-            
-            for pattern in price_patterns:
-                matches = re.findall(pattern, chunk, re.IGNORECASE)
-                if matches:
-                    return matches[0].strip()
+            # Una sola pasada por chunk: gana el patrón de mayor prioridad y,
+            # dentro de él, la primera coincidencia
+            best = None
+            for match in _CHUNK_PRICE_RE.finditer(chunk):
+                if best is None or match.lastindex < best.lastindex:
+                    best = match
+                    if match.lastindex == 1:
+                        break
+            
+            if best:
+                return best.group().strip()
         
         return None
     
@@ -392,9 +902,7 @@ class ModelManager:
         else:
             model = AutoModel.from_pretrained(filepath)
         
-        model.to(self.device)
-        model.eval()
-        self.loaded_models[model_type] = model
+        self.loaded_models[model_type] = self._prepare_model(model)
         logger.info(f"Model {model_type} loaded from {filepath}")
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -406,15 +914,46 @@ class ModelManager:
             "memory_usage": {}
         }
         
+        # Pico de memoria residente del proceso (ru_maxrss está en KB en Linux)
+        if RESOURCE_AVAILABLE:
+            info["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        
         # Información de memoria por modelo
         for model_type, model in self.loaded_models.items():
             if hasattr(model, 'parameters'):
-                total_params = sum(p.numel() for p in model.parameters())
-                trainable_params = sum(p.numel() for p in model.parameters() if p.requires_grad)
-                info["memory_usage"][model_type] = {
-                    "total_parameters": total_params,
-                    "trainable_parameters": trainable_params,
-                    "model_size_mb": total_params * 4 / (1024 * 1024)  # Aproximado
-                }
-        
-        return info 
\ No newline at end of file
+                info["memory_usage"][model_type] = self._get_model_stats(model_type, model)
+        
+        return info
+    
+    def _get_model_stats(self, model_type: str, model: Any) -> Dict[str, Any]:
+        """
+        Obtener el recuento de parámetros de un modelo, calculado una sola vez.
+        
+        Args:
+            model_type: Tipo de modelo
+            model: Modelo cargado para ese tipo
+            
+        Returns:
+            Diccionario con parámetros totales, entrenables y tamaño en MB
+        """
+        cached = self._model_stats.get(model_type)
+        if cached and cached[0] is model:
+            return cached[1]
+        
+        total_params = 0
+        trainable_params = 0
+        size_bytes = 0
+        for p in model.parameters():
+            numel = p.numel()
+            total_params += numel
+            size_bytes += numel * p.element_size()
+            if p.requires_grad:
+                trainable_params += numel
+        
+        stats = {
+            "total_parameters": total_params,
+            "trainable_parameters": trainable_params,
+            "model_size_mb": size_bytes / (1024 * 1024)
+        }
+        self._model_stats[model_type] = (model, stats)
+        return stats 
\ No newline at end of file
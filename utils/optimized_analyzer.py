@@ -6,12 +6,43 @@ Implementa principios de desarrollo robusto y eficiente.
 import os
 import json
 import time
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import asyncio
-import aiohttp
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 # Imports locales
 from .model_manager import ModelManager
@@ -21,27 +52,163 @@ from .extract_price import extract_price_from_text, clean_text
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Caché de análisis por (texto, fuente)
+ANALYSIS_CACHE_SIZE = 1000
+ANALYSIS_CACHE_TTL = 3600  # segundos
+# Límite de la caché persistente en disco (ANALYSIS_CACHE_DIR)
+ANALYSIS_DISK_CACHE_SIZE_LIMIT = 1 << 30  # bytes
+
+# Prompt de análisis para GPT: partes constantes alrededor del texto (truncado)
+GPT_PROMPT_MAX_CHARS = 1000
+GPT_PROMPT_PREFIX = """
+        Analiza el siguiente texto de un proveedor de servicios de marca blanca y proporciona:
+
+        1. **Precio estimado**: Formato "$X,XXX" o "No especificado"
+        2. **Clasificación del módulo**: Una de estas categorías:
+           - Wallet Base, Wallet Avanzado, KYC/KYB, Tarjeta, Trading Platform
+           - Payment Gateway, Liquidity Provider, Compliance, API Integration
+           - White Label Solution, Otro (especificar)
+        3. **Condiciones comerciales**: JSON con setup_fee, monthly_cost, transaction_fees, etc.
+
+        Texto: """
+GPT_PROMPT_SUFFIX = """...
+
+        Responde en formato JSON:
+        {
+            "precio_estimado": "string",
+            "clasificacion_modulo": "string",
+            "condiciones_comerciales": {
+                "setup_fee": "string",
+                "monthly_cost": "string",
+                "transaction_fees": "string",
+                "minimum_requirements": "string",
+                "contract_terms": "string"
+            },
+            "confianza_analisis": "alta|media|baja"
+        }
+        """
+
+# Palabras clave básicas memorizadas por texto limpio: la cascada las consulta en el
+# paso local y de nuevo en el básico sin volver a copiar el texto en minúsculas
+KEYWORDS_CACHE_SIZE = 1024
+
+# Clasificación básica por palabras clave, en orden de prioridad (texto en minúsculas)
+_BASIC_MODULE_KEYWORDS = (
+    ("Wallet Base", ("wallet", "crypto")),
+    ("KYC/KYB", ("kyc", "kyb", "verification")),
+    ("Trading Platform", ("trading", "exchange")),
+    ("Payment Gateway", ("payment", "gateway")),
+    ("White Label Solution", ("white label", "whitelabel"))
+)
+
+# Condiciones comerciales: se marcan si aparecen todas sus palabras clave
+_BASIC_CONDITION_KEYWORDS = (
+    ("setup_fee", ("setup", "fee")),
+    ("monthly_cost", ("monthly", "cost")),
+    ("transaction_fees", ("transaction", "fee"))
+)
+
+# Condiciones comerciales sin datos y análisis de respaldo (plantillas: se copian,
+# no se devuelven directamente, porque los resultados se cachean y se exponen)
+_DEFAULT_CONDITIONS = {
+    "setup_fee": "No especificado",
+    "monthly_cost": "No especificado",
+    "transaction_fees": "No especificado",
+    "minimum_requirements": "No especificado",
+    "contract_terms": "No especificado"
+}
+
+_FALLBACK_ANALYSIS = {
+    "precio_estimado": "No especificado",
+    "clasificacion_modulo": "No clasificado",
+    "confianza_analisis": "baja"
+}
+
+_BASIC_KEYWORDS = frozenset(
+    keyword
+    for _, keywords in _BASIC_MODULE_KEYWORDS + _BASIC_CONDITION_KEYWORDS
+    for keyword in keywords
+)
+
+# Autómata con todas las palabras clave: una sola pasada por texto en lugar de
+# una búsqueda por palabra clave
+if AHOCORASICK_AVAILABLE:
+    _BASIC_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _BASIC_KEYWORDS:
+        _BASIC_AUTOMATON.add_word(_keyword, _keyword)
+    _BASIC_AUTOMATON.make_automaton()
+    del _keyword
+
+
+@lru_cache(maxsize=KEYWORDS_CACHE_SIZE)
+def _find_basic_keywords(text: str) -> frozenset:
+    """
+    Palabras clave básicas presentes en el texto.
+    
+    Args:
+        text: Texto a analizar
+        
+    Returns:
+        Conjunto de palabras clave encontradas
+    """
+    text_lower = text.lower()
+    if AHOCORASICK_AVAILABLE:
+        return frozenset(keyword for _, keyword in _BASIC_AUTOMATON.iter(text_lower))
+    return frozenset(keyword for keyword in _BASIC_KEYWORDS if keyword in text_lower)
+
+
+def _cache_key(text: str, source: str) -> tuple:
+    """
+    Clave estable de caché: hash xxh3 de 64 bits del texto (blake2b sin xxhash)
+    más la fuente.
+    
+    A diferencia de ``hash()``, no depende de la semilla aleatoria del proceso.
+    
+    Args:
+        text: Texto original
+        source: Fuente del texto
+        
+    Returns:
+        Tupla (digest, fuente)
+    """
+    if XXHASH_AVAILABLE:
+        return (xxhash.xxh3_64_intdigest(text), source)
+    return (hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), source)
+
 class OptimizedAnalyzer:
     """
     Analizador optimizado que combina modelos locales (Hugging Face) 
     con análisis GPT para máxima eficiencia y precisión.
     """
     
-    def __init__(self, use_local_models: bool = True, use_gpt: bool = True):
+    def __init__(self, use_local_models: bool = True, use_gpt: bool = True,
+                 use_int8: Optional[bool] = None, use_compile: Optional[bool] = None,
+                 cache_dir: Optional[str] = None):
         """
         Inicializar el analizador optimizado.
         
         Args:
             use_local_models: Si usar modelos locales de Hugging Face
             use_gpt: Si usar análisis GPT como respaldo
+            use_int8: Cuantizar a int8 los modelos locales en CPU
+                (por defecto, variable de entorno MODEL_QUANTIZE_CPU)
+            use_compile: Compilar los modelos locales con torch.compile en GPU
+                (por defecto, variable de entorno MODEL_USE_COMPILE)
+            cache_dir: Directorio de la caché persistente de análisis (requiere
+                diskcache; por defecto, variable de entorno ANALYSIS_CACHE_DIR)
         """
         self.use_local_models = use_local_models
         self.use_gpt = use_gpt
         
         # Inicializar gestor de modelos locales
+        self.model_manager = None
         if use_local_models:
             try:
-                self.model_manager = ModelManager()
+                self.model_manager = ModelManager(quantize_cpu=use_int8, use_compile=use_compile)
+                # Con modelos compilados, pagar la compilación al arrancar y no en
+                # la primera petición (solo embeddings ejecuta el modelo)
+                if self.model_manager.use_compile and self.model_manager.device.type == "cuda":
+                    self.model_manager.warmup(["embedding"])
                 logger.info("Local models initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize local models: {str(e)}")
@@ -49,22 +216,44 @@ class OptimizedAnalyzer:
                 self.model_manager = None
         
         # Configurar OpenAI si está disponible
-        if use_gpt:
+        self.openai_available = False
+        self._aclient = None
+        if use_gpt and not OPENAI_AVAILABLE:
+            logger.warning("OpenAI not available, using local models only")
+        elif use_gpt:
             try:
-                import openai
+                # Cliente asíncrono: no bloquea el event loop y reutiliza conexiones
+                self._aclient = openai.AsyncOpenAI()
                 self.openai_available = True
                 logger.info("OpenAI GPT available for backup analysis")
-            except ImportError:
-                self.openai_available = False
-                logger.warning("OpenAI not available, using local models only")
+            except Exception as e:
+                logger.warning(f"Failed to initialize OpenAI client: {str(e)}")
         
-        # Cache para resultados
-        self.analysis_cache = {}
-        self.cache_ttl = 3600  # 1 hora
+        # Cache acotada para resultados con expiración por TTL
+        # Estructuras paralelas: resultados por clave y timestamps en orden de
+        # inserción (el primero es siempre el más antiguo, el próximo en expirar)
+        self.analysis_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._cache_ts: OrderedDict = OrderedDict()
+        self.cache_size = ANALYSIS_CACHE_SIZE
+        self.cache_ttl = ANALYSIS_CACHE_TTL
         
-        # Configurar procesamiento paralelo
-        self.max_workers = min(4, os.cpu_count() or 1)
-        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Segundo nivel opcional en disco: los análisis sobreviven a reinicios y se
+        # comparten entre procesos (SQLite, con expiración por TTL)
+        self._disk_cache = None
+        cache_dir = cache_dir or os.getenv('ANALYSIS_CACHE_DIR')
+        if cache_dir and not DISKCACHE_AVAILABLE:
+            logger.warning("diskcache not installed; analysis cache will be in-memory only")
+        elif cache_dir:
+            try:
+                self._disk_cache = diskcache.Cache(cache_dir, size_limit=ANALYSIS_DISK_CACHE_SIZE_LIMIT)
+                logger.info(f"Persistent analysis cache at {cache_dir}")
+            except Exception as e:
+                logger.warning(f"Failed to open persistent analysis cache: {str(e)}")
+        
+        # Configurar procesamiento paralelo: máximo de llamadas a GPT simultáneas
+        self.max_workers = min(16, (os.cpu_count() or 4) * 2)
+        # El semáforo se crea dentro del event loop en el primer uso
+        self._sem: Optional[asyncio.Semaphore] = None
     
     async def analyze_text_optimized(self, text: str, source: str = "unknown") -> Dict[str, Any]:
         """
@@ -78,12 +267,11 @@ class OptimizedAnalyzer:
             Resultado del análisis optimizado
         """
         # Verificar cache primero
-        cache_key = f"{hash(text)}_{source}"
-        if cache_key in self.analysis_cache:
-            cached_result = self.analysis_cache[cache_key]
-            if time.time() - cached_result.get("timestamp", 0) < self.cache_ttl:
-                logger.info(f"Using cached analysis for {source}")
-                return cached_result["result"]
+        cache_key = _cache_key(text, source)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached analysis for {source}")
+            return cached
         
         # Limpiar texto
         cleaned_text = clean_text(text)
@@ -92,27 +280,131 @@ class OptimizedAnalyzer:
         analysis_result = await self._cascade_analysis(cleaned_text, source)
         
         # Guardar en cache
-        self.analysis_cache[cache_key] = {
-            "result": analysis_result,
-            "timestamp": time.time()
-        }
+        self._cache_put(cache_key, analysis_result)
         
         return analysis_result
     
-    async def _cascade_analysis(self, text: str, source: str) -> Dict[str, Any]:
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Obtener un resultado vigente de la caché.
+        
+        Args:
+            key: Clave generada por ``_cache_key``
+            
+        Returns:
+            Resultado cacheado o None si no existe o expiró
+        """
+        result = self.analysis_cache.get(key)
+        if result is None:
+            result = self._disk_cache_get(key)
+            if result is not None:
+                # Promover a memoria con la hora actual: _expire_cache asume _cache_ts
+                # ordenado por inserción
+                now = time.time()
+                self._cache_ts[key] = now
+                self.analysis_cache[key] = result
+                self._expire_cache(now)
+                self._evict_oldest(self.cache_size)
+            return result
+        now = time.time()
+        if now - self._cache_ts[key] >= self.cache_ttl:
+            self._expire_cache(now)
+            return None
+        return result
+    
+    def _cache_put(self, key: tuple, result: Dict[str, Any]):
+        """
+        Guardar un resultado, desalojando los más antiguos si se supera el tamaño.
+        
+        Args:
+            key: Clave generada por ``_cache_key``
+            result: Resultado del análisis
+        """
+        now = time.time()
+        self._cache_ts.pop(key, None)
+        self._cache_ts[key] = now
+        self.analysis_cache[key] = result
+        self._expire_cache(now)
+        self._evict_oldest(self.cache_size)
+        
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(key, result, expire=self.cache_ttl)
+            except Exception as e:
+                logger.warning(f"Failed to write persistent analysis cache: {str(e)}")
+    
+    def _disk_cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Buscar un resultado en la caché persistente (si está configurada).
+        
+        Args:
+            key: Clave generada por ``_cache_key``
+            
+        Returns:
+            Resultado cacheado o None si no existe, expiró o no hay caché en disco
+        """
+        if self._disk_cache is None:
+            return None
+        try:
+            return self._disk_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read persistent analysis cache: {str(e)}")
+            return None
+    
+    def _expire_cache(self, now: float) -> int:
+        """
+        Eliminar las entradas expiradas, recorriendo solo desde la más antigua.
+        
+        Args:
+            now: Instante actual (time.time())
+            
+        Returns:
+            Número de entradas eliminadas
+        """
+        removed = 0
+        while self._cache_ts and now - next(iter(self._cache_ts.values())) >= self.cache_ttl:
+            key, _ = self._cache_ts.popitem(last=False)
+            del self.analysis_cache[key]
+            removed += 1
+        return removed
+    
+    def _evict_oldest(self, max_size: int) -> int:
+        """
+        Desalojar las entradas más antiguas hasta quedar en max_size.
+        
+        Args:
+            max_size: Número máximo de entradas
+            
+        Returns:
+            Número de entradas eliminadas
+        """
+        removed = 0
+        while len(self._cache_ts) > max_size:
+            key, _ = self._cache_ts.popitem(last=False)
+            del self.analysis_cache[key]
+            removed += 1
+        return removed
+    
+    async def _cascade_analysis(self, text: str, source: str,
+                                local_result: Optional[Dict[str, Any]] = None,
+                                timestamp: Optional[str] = None) -> Dict[str, Any]:
         """
         Análisis en cascada: modelos locales primero, GPT como respaldo.
         
         Args:
             text: Texto limpio a analizar
             source: Fuente del texto
+            local_result: Resultado local ya calculado (p. ej. por lotes); si es
+                None se calcula aquí
+            timestamp: Marca ISO del análisis (p. ej. compartida por un lote); si es
+                None se toma la hora actual
             
         Returns:
             Resultado del análisis
         """
         result = {
             "fuente": source,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "analysis_method": "unknown",
             "precio_estimado": "No especificado",
             "clasificacion_modulo": "No clasificado",
@@ -123,7 +415,8 @@ class OptimizedAnalyzer:
         # Paso 1: Análisis con modelos locales (más rápido)
         if self.use_local_models and self.model_manager:
             try:
-                local_result = await self._analyze_with_local_models(text)
+                if local_result is None:
+                    local_result = await self._analyze_with_local_models(text)
                 if local_result and local_result.get("confianza_analisis") != "baja":
                     result.update(local_result)
                     result["analysis_method"] = "local_models"
@@ -168,38 +461,60 @@ class OptimizedAnalyzer:
                 text, task="embedding"
             )
             
-            # Combinar resultados
-            result = {
-                "clasificacion_modulo": classification_result.get("clasificacion_modulo"),
-                "confianza_analisis": classification_result.get("confianza_analisis"),
-                "precio_estimado": price_result if price_result else "No especificado",
-                "embedding_info": embedding_result.get("embedding_dim"),
-                "scores": classification_result.get("scores", {})
-            }
-            
-            # Extraer condiciones comerciales básicas
-            result["condiciones_comerciales"] = self._extract_basic_conditions(text)
-            
-            return result
+            return self._combine_local_results(text, classification_result, price_result, embedding_result)
             
         except Exception as e:
             logger.error(f"Error in local model analysis: {str(e)}")
             return None
     
+    async def _analyze_batch_with_local_models(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Análisis local de varios textos con forwards por lotes.
+        
+        Args:
+            texts: Textos limpios a analizar
+            
+        Returns:
+            Lista alineada con texts de resultados locales (None si falló)
+        """
+        try:
+            batch = self.model_manager.batch_analyze(texts)
+            return [
+                self._combine_local_results(text, item["classification"], item["price"], item["embedding"])
+                for text, item in zip(texts, batch)
+            ]
+        except Exception as e:
+            logger.error(f"Error in local model batch analysis: {str(e)}")
+            return [None] * len(texts)
+    
+    def _combine_local_results(self, text: str, classification_result: Dict[str, Any],
+                               price_result: Optional[str],
+                               embedding_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Combinar clasificación, precio y embedding en el resultado local."""
+        result = {
+            "clasificacion_modulo": classification_result.get("clasificacion_modulo"),
+            "confianza_analisis": classification_result.get("confianza_analisis"),
+            "precio_estimado": price_result if price_result else "No especificado",
+            "embedding_info": embedding_result.get("embedding_dim"),
+            "scores": classification_result.get("scores", {})
+        }
+        
+        # Extraer condiciones comerciales básicas
+        result["condiciones_comerciales"] = self._extract_basic_conditions(text)
+        
+        return result
+    
     async def _analyze_with_gpt(self, text: str) -> Optional[Dict[str, Any]]:
         """Análisis usando GPT como respaldo."""
         try:
-            import openai
-            
             # Prompt optimizado para GPT
             prompt = self._create_optimized_gpt_prompt(text)
             
-            # Llamada a GPT con timeout
-            async with aiohttp.ClientSession() as session:
-                response = await asyncio.wait_for(
-                    self._call_gpt_async(session, prompt),
-                    timeout=30.0
-                )
+            # Llamada a GPT (el timeout lo aplica el cliente), acotando la concurrencia
+            if self._sem is None:
+                self._sem = asyncio.Semaphore(self.max_workers)
+            async with self._sem:
+                response = await self._call_gpt_async(prompt)
             
             if response:
                 return self._parse_gpt_response(response)
@@ -209,12 +524,17 @@ class OptimizedAnalyzer:
         
         return None
     
-    async def _call_gpt_async(self, session: aiohttp.ClientSession, prompt: str) -> Optional[str]:
+    async def aclose(self):
+        """Cerrar el cliente de OpenAI y su pool de conexiones."""
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
+            self.openai_available = False
+    
+    async def _call_gpt_async(self, prompt: str) -> Optional[str]:
         """Llamada asíncrona a GPT."""
         try:
-            import openai
-            
-            response = openai.ChatCompletion.create(
+            response = await self._aclient.chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {
@@ -227,7 +547,8 @@ class OptimizedAnalyzer:
                     }
                 ],
                 temperature=0.3,
-                max_tokens=1000
+                max_tokens=1000,
+                timeout=30
             )
             
             return response.choices[0].message.content.strip()
@@ -238,42 +559,23 @@ class OptimizedAnalyzer:
     
     def _create_optimized_gpt_prompt(self, text: str) -> str:
         """Crear prompt optimizado para GPT."""
-        return f"""
-        Analiza el siguiente texto de un proveedor de servicios de marca blanca y proporciona:
-
-        1. **Precio estimado**: Formato "$X,XXX" o "No especificado"
-        2. **Clasificación del módulo**: Una de estas categorías:
-           - Wallet Base, Wallet Avanzado, KYC/KYB, Tarjeta, Trading Platform
-           - Payment Gateway, Liquidity Provider, Compliance, API Integration
-           - White Label Solution, Otro (especificar)
-        3. **Condiciones comerciales**: JSON con setup_fee, monthly_cost, transaction_fees, etc.
-
-        Texto: {text[:1000]}...
-
-        Responde en formato JSON:
-        {{
-            "precio_estimado": "string",
-            "clasificacion_modulo": "string",
-            "condiciones_comerciales": {{
-                "setup_fee": "string",
-                "monthly_cost": "string",
-                "transaction_fees": "string",
-                "minimum_requirements": "string",
-                "contract_terms": "string"
-            }},
-            "confianza_analisis": "alta|media|baja"
-        }}
-        """
+        return "".join((GPT_PROMPT_PREFIX, text[:GPT_PROMPT_MAX_CHARS], GPT_PROMPT_SUFFIX))
     
     def _parse_gpt_response(self, response: str) -> Dict[str, Any]:
         """Parsear respuesta de GPT."""
         try:
-            # Limpiar respuesta si tiene markdown
+            # Limpiar respuesta si tiene markdown (solo las vallas de los extremos)
             if response.startswith('```json'):
-                response = response.replace('```json', '').replace('```', '').strip()
+                response = response[len('```json'):].rstrip()
+                if response.endswith('```'):
+                    response = response[:-len('```')]
+                response = response.strip()
             
+            if ORJSON_AVAILABLE:
+                return orjson.loads(response)
             return json.loads(response)
             
+        # orjson.JSONDecodeError es subclase de json.JSONDecodeError
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing GPT response: {str(e)}")
             return self._get_fallback_analysis()
@@ -283,63 +585,38 @@ class OptimizedAnalyzer:
         # Extraer precio usando regex
         price = extract_price_from_text(text)
         
-        # Clasificación básica por palabras clave
-        text_lower = text.lower()
-        module = "General Service"
-        
-        if any(keyword in text_lower for keyword in ["wallet", "crypto"]):
-            module = "Wallet Base"
-        elif any(keyword in text_lower for keyword in ["kyc", "kyb", "verification"]):
-            module = "KYC/KYB"
-        elif any(keyword in text_lower for keyword in ["trading", "exchange"]):
-            module = "Trading Platform"
-        elif any(keyword in text_lower for keyword in ["payment", "gateway"]):
-            module = "Payment Gateway"
-        elif any(keyword in text_lower for keyword in ["white label", "whitelabel"]):
-            module = "White Label Solution"
+        # Clasificación básica por palabras clave (una pasada para módulo y condiciones)
+        found = _find_basic_keywords(text)
+        module = next(
+            (name for name, keywords in _BASIC_MODULE_KEYWORDS if not found.isdisjoint(keywords)),
+            "General Service"
+        )
         
         return {
             "precio_estimado": price if price else "No especificado",
             "clasificacion_modulo": module,
             "confianza_analisis": "baja",
-            "condiciones_comerciales": self._extract_basic_conditions(text)
+            "condiciones_comerciales": self._extract_basic_conditions(text, found)
         }
     
-    def _extract_basic_conditions(self, text: str) -> Dict[str, str]:
+    def _extract_basic_conditions(self, text: str, found: Optional[frozenset] = None) -> Dict[str, str]:
         """Extraer condiciones comerciales básicas."""
-        text_lower = text.lower()
-        conditions = {
-            "setup_fee": "No especificado",
-            "monthly_cost": "No especificado",
-            "transaction_fees": "No especificado",
-            "minimum_requirements": "No especificado",
-            "contract_terms": "No especificado"
-        }
+        if found is None:
+            found = _find_basic_keywords(text)
+        conditions = _DEFAULT_CONDITIONS.copy()
         
         # Buscar patrones básicos
-        if "setup" in text_lower and "fee" in text_lower:
-            conditions["setup_fee"] = "Mencionado"
-        if "monthly" in text_lower and "cost" in text_lower:
-            conditions["monthly_cost"] = "Mencionado"
-        if "transaction" in text_lower and "fee" in text_lower:
-            conditions["transaction_fees"] = "Mencionado"
+        for name, keywords in _BASIC_CONDITION_KEYWORDS:
+            if found.issuperset(keywords):
+                conditions[name] = "Mencionado"
         
         return conditions
     
     def _get_fallback_analysis(self) -> Dict[str, Any]:
         """Análisis de respaldo cuando todo falla."""
-        return {
-            "precio_estimado": "No especificado",
-            "clasificacion_modulo": "No clasificado",
-            "confianza_analisis": "baja",
-            "condiciones_comerciales": {
-                "setup_fee": "No especificado",
-                "monthly_cost": "No especificado",
-                "transaction_fees": "No especificado",
-                "minimum_requirements": "No especificado",
-                "contract_terms": "No especificado"
-            }
-        }
+        result = _FALLBACK_ANALYSIS.copy()
+        result["condiciones_comerciales"] = _DEFAULT_CONDITIONS.copy()
+        return result
     
     async def analyze_batch_optimized(self, texts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -353,33 +630,53 @@ class OptimizedAnalyzer:
         """
         logger.info(f"Starting batch analysis of {len(texts)} texts")
         
-        # Procesar en paralelo
-        tasks = []
-        for text_data in texts:
-            task = self.analyze_text_optimized(
-                text_data.get('text', ''),
-                text_data.get('source', 'unknown')
+        # Separar aciertos de caché de los textos pendientes
+        processed_results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        pending = []  # (índice, clave, texto limpio, fuente)
+        for i, text_data in enumerate(texts):
+            text = text_data.get('text', '')
+            source = text_data.get('source', 'unknown')
+            cache_key = _cache_key(text, source)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                processed_results[i] = cached
+            else:
+                pending.append((i, cache_key, clean_text(text), source))
+        
+        # Modelos locales: un forward por lote para todos los textos pendientes
+        local_results = [None] * len(pending)
+        if pending and self.use_local_models and self.model_manager:
+            local_results = await self._analyze_batch_with_local_models(
+                [cleaned for _, _, cleaned, _ in pending]
             )
-            task = asyncio.create_task(task)
-            tasks.append(task)
         
-        # Ejecutar todas las tareas
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Todos los resultados del lote comparten la misma marca de tiempo
+        batch_timestamp = datetime.now().isoformat()
+        
+        # Completar la cascada (GPT / básico) en paralelo solo donde haga falta
+        results = await asyncio.gather(
+            *(
+                self._cascade_analysis(cleaned, source, local_result, batch_timestamp)
+                for (_, _, cleaned, source), local_result in zip(pending, local_results)
+            ),
+            return_exceptions=True
+        )
         
         # Procesar resultados
-        processed_results = []
-        for i, result in enumerate(results):
+        for (i, cache_key, _, _), result in zip(pending, results):
             if isinstance(result, Exception):
                 logger.error(f"Error analyzing text {i}: {str(result)}")
-                processed_results.append(self._get_fallback_analysis())
+                processed_results[i] = self._get_fallback_analysis()
             else:
-                processed_results.append(result)
+                self._cache_put(cache_key, result)
+                processed_results[i] = result
         
         logger.info(f"Batch analysis completed: {len(processed_results)} results")
         return processed_results
     
     def get_analysis_stats(self) -> Dict[str, Any]:
         """Obtener estadísticas del análisis."""
+        self._expire_cache(time.time())
         stats = {
             "cache_size": len(self.analysis_cache),
             "cache_hit_rate": 0.0,
@@ -390,7 +687,7 @@ class OptimizedAnalyzer:
         # Calcular estadísticas de métodos de análisis
         method_counts = {}
         for cached_result in self.analysis_cache.values():
-            method = cached_result["result"].get("analysis_method", "unknown")
+            method = cached_result.get("analysis_method", "unknown")
             method_counts[method] = method_counts.get(method, 0) + 1
         
         stats["analysis_methods"] = method_counts
@@ -404,19 +701,25 @@ class OptimizedAnalyzer:
     def clear_cache(self):
         """Limpiar cache de análisis."""
         self.analysis_cache.clear()
+        self._cache_ts.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
         logger.info("Analysis cache cleared")
     
-    def optimize_cache(self, max_size: int = 1000):
-        """Optimizar cache eliminando entradas antiguas."""
-        if len(self.analysis_cache) > max_size:
-            # Eliminar entradas más antiguas
-            current_time = time.time()
-            old_entries = [
-                key for key, value in self.analysis_cache.items()
-                if current_time - value.get("timestamp", 0) > self.cache_ttl
-            ]
-            
-            for key in old_entries:
-                del self.analysis_cache[key]
-            
-            logger.info(f"Cache optimized: removed {len(old_entries)} old entries") 
\ No newline at end of file
+    def optimize_cache(self, max_size: int = ANALYSIS_CACHE_SIZE):
+        """
+        Optimizar cache eliminando entradas expiradas y ajustando su tamaño máximo.
+        
+        Solo se recorren las entradas eliminadas (desde la más antigua), no toda
+        la caché.
+        
+        Args:
+            max_size: Nuevo tamaño máximo de la caché
+        """
+        self.cache_size = max_size
+        removed = self._expire_cache(time.time()) + self._evict_oldest(max_size)
+        if self._disk_cache is not None:
+            removed += self._disk_cache.expire()
+        
+        if removed:
+            logger.info(f"Cache optimized: removed {removed} old entries")
@@ -5,17 +5,211 @@ Integrado con análisis de LATAM/México y validación cruzada.
 
 import os
 import json
+import time
+import uuid
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 import asyncio
 
 import pinecone
+import torch
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+from .extract_price import _COUNTRY_NAMES, _MODULE_NAMES
+
 logger = logging.getLogger(__name__)
 
+# Longitud máxima del texto que se embebe y se guarda en metadata
+MAX_TEXT_LENGTH = 1000
+
+# Modelo de embeddings (dimensión 384)
+EMBEDDING_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# Textos por forward del modelo de embeddings
+EMBEDDING_BATCH_SIZE = 32
+
+# Tokens máximos por texto (max_seq_length de all-MiniLM-L6-v2)
+EMBEDDING_MAX_SEQ_LENGTH = 256
+
+# Backend de embeddings: "torch" (SentenceTransformer) u "ort" (ONNX Runtime int8)
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch').lower()
+# Directorio del modelo exportado y cuantizado (se genera la primera vez)
+EMBEDDING_ONNX_DIR = os.getenv('EMBEDDING_ONNX_DIR', './models_cache/all-MiniLM-L6-v2-onnx-int8')
+ORT_QUANTIZED_FILE = 'model_quantized.onnx'
+
+# Hilos intra-op de torch para el encoder (0 = no modificar, por defecto). Útil si
+# los encodes lanzados desde varios hilos sobresuscriben la CPU, pero afecta a todo
+# el proceso: limita también a ModelManager y a cualquier otro uso de torch
+EMBEDDING_NUM_THREADS = int(os.getenv('EMBEDDING_NUM_THREADS', '0'))
+
+# Embeddings memorizados por texto truncado (~1.5 KB cada uno en float32)
+EMBEDDING_CACHE_SIZE = 4096
+
+# Caché de resultados de search_similar (se vacía con cada escritura en el índice)
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 600  # segundos
+# Similitud coseno mínima para reutilizar los resultados de otra consulta
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+# Vectores por petición de upsert (límite recomendado por Pinecone)
+UPSERT_BATCH_SIZE = 100
+
+# Textos por tramo en store_data_bulk: los upserts de un tramo viajan mientras
+# se calculan los embeddings del siguiente (múltiplo de UPSERT_BATCH_SIZE)
+ENCODE_SHARD_SIZE = 500
+
+# Hilos para peticiones concurrentes (upserts con async_req, consultas en paralelo)
+INDEX_POOL_THREADS = 30
+
+# Valores de 'pais' y 'modulo' contados con describe_index_stats en get_statistics
+# (un RPC por valor, en paralelo); se pueden sustituir por llamada
+STATS_COUNTRIES = tuple(_COUNTRY_NAMES)
+STATS_MODULES = tuple(_MODULE_NAMES)
+# Vectores como máximo que se leen para desglosar los valores fuera de esas listas
+STATS_SAMPLE_SIZE = 1000
+
+# Vectores por consulta al migrar los escritos sin timestamp_epoch
+LEGACY_SCAN_SIZE = 1000
+
+class ORTSentenceEncoder:
+    """
+    MiniLM sobre ONNX Runtime con pesos int8 (cuantización dinámica, kernels VNNI).
+    
+    Implementa la parte de la interfaz de SentenceTransformer que usa el gestor
+    (encode y get_sentence_embedding_dimension) con el mismo pipeline que
+    all-MiniLM-L6-v2: mean pooling sobre la máscara de atención y normalización L2.
+    """
+    
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, onnx_dir: str = EMBEDDING_ONNX_DIR):
+        """
+        Cargar el modelo cuantizado, exportándolo y cuantizándolo la primera vez.
+        
+        Args:
+            model_name: Nombre del modelo en el Hub
+            onnx_dir: Directorio donde se guarda el modelo ONNX cuantizado
+        """
+        onnx_path = Path(onnx_dir)
+        if not (onnx_path / ORT_QUANTIZED_FILE).exists():
+            logger.info(f"Exportando {model_name} a ONNX int8 en {onnx_path}")
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=str(onnx_path),
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(str(onnx_path))
+        
+        self.model = ORTModelForFeatureExtraction.from_pretrained(str(onnx_path), file_name=ORT_QUANTIZED_FILE)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(onnx_path), use_fast=True)
+        self.dimension = self.model.config.hidden_size
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        """Dimensión de los embeddings."""
+        return self.dimension
+    
+    def encode(self, texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE, **kwargs) -> np.ndarray:
+        """
+        Crear embeddings normalizados en lotes.
+        
+        Los textos se agrupan ordenados por longitud (como SentenceTransformer)
+        para minimizar el padding de cada lote.
+        
+        Args:
+            texts: Textos a convertir en embeddings
+            batch_size: Textos por forward
+            
+        Returns:
+            Array float32 (N textos x dimensión), en el mismo orden que texts
+        """
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        
+        for start in range(0, len(texts), batch_size):
+            batch_indices = order[start:start + batch_size]
+            inputs = self.tokenizer(
+                [texts[i] for i in batch_indices],
+                padding=True,
+                truncation=True,
+                max_length=EMBEDDING_MAX_SEQ_LENGTH,
+                return_tensors='np'
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            
+            # Mean pooling sobre los tokens reales y normalización L2
+            mask = inputs['attention_mask'][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            embeddings[batch_indices] = pooled / np.clip(norms, 1e-12, None)
+        
+        return embeddings
+
+# Modelos de embeddings cargados, compartidos por todos los gestores del proceso
+_embedding_models: Dict[Tuple[str, str], Any] = {}
+_embedding_models_lock = threading.Lock()
+
+def get_embedding_model(model_name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND):
+    """
+    Obtener el modelo de embeddings, cargándolo una sola vez por proceso.
+    
+    Args:
+        model_name: Nombre del modelo en el Hub
+        backend: "torch" (SentenceTransformer) u "ort" (ONNX Runtime int8)
+        
+    Returns:
+        ORTSentenceEncoder si se pidió "ort" y está disponible; si no, SentenceTransformer
+    """
+    key = (model_name, backend)
+    model = _embedding_models.get(key)
+    if model is not None:
+        return model
+    
+    with _embedding_models_lock:
+        model = _embedding_models.get(key)
+        if model is None:
+            model = _load_embedding_model(model_name, backend)
+            _embedding_models[key] = model
+    return model
+
+def _load_embedding_model(model_name: str, backend: str):
+    """Cargar el modelo de embeddings del backend indicado (con fallback a SentenceTransformer)."""
+    if backend == 'ort':
+        if ORT_AVAILABLE:
+            try:
+                model = ORTSentenceEncoder(model_name)
+                logger.info("✅ Modelo de embeddings ONNX Runtime int8 cargado")
+                return model
+            except Exception as e:
+                logger.error(f"❌ Error cargando modelo ONNX, se usa SentenceTransformer: {str(e)}")
+        else:
+            logger.warning("⚠️ optimum[onnxruntime] no instalado, se usa SentenceTransformer")
+    
+    if EMBEDDING_NUM_THREADS > 0:
+        torch.set_num_threads(EMBEDDING_NUM_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Solo se puede fijar antes del primer trabajo paralelo de torch
+            pass
+    
+    model = SentenceTransformer(model_name)
+    logger.info(f"✅ Modelo de embeddings {model_name} cargado")
+    return model
+
 class PineconeManager:
     """
     Gestor para operaciones con Pinecone incluyendo embeddings y metadata.
@@ -40,14 +234,33 @@ class PineconeManager:
         # Inicializar Pinecone
         pinecone.init(api_key=self.api_key, environment=self.environment)
         
-        # Cargar modelo de embeddings
-        self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        # Caché LRU de embeddings: las consultas sintéticas de search_by_module y
+        # search_by_country se repiten literalmente. Se accede desde varios hilos
+        # (asyncio.to_thread), de ahí el lock
+        self._embedding_cache: OrderedDict = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        
+        # Caché de búsquedas: (consulta, filtros, top_k) -> (timestamp, embedding, resultados)
+        self._search_cache: OrderedDict = OrderedDict()
+        self._search_cache_lock = threading.Lock()
         
         # Verificar/conectar al índice
         self._ensure_index_exists()
         
+        # Cliente único del índice: reutiliza las conexiones HTTP (keep-alive) entre
+        # llamadas y su pool de hilos permite upserts en paralelo
+        self._index = pinecone.Index(self.index_name, pool_threads=INDEX_POOL_THREADS)
+        
+        # Contador monotónico de escrituras (invalida cachés de consultas)
+        self.version = 0
+        
         logger.info(f"✅ PineconeManager inicializado - Índice: {self.index_name}")
     
+    @property
+    def embedding_model(self):
+        """Modelo de embeddings compartido; se carga en el primer uso, no al construir el gestor."""
+        return get_embedding_model()
+    
     def _ensure_index_exists(self):
         """Asegurar que el índice existe, crearlo si no."""
         try:
@@ -58,7 +271,7 @@ class PineconeManager:
                     dimension=384,  # Dimension del modelo all-MiniLM-L6-v2
                     metric='cosine',
                     metadata_config={
-                        'indexed': ['proveedor', 'pais', 'region', 'modulo', 'moneda', 'fecha']
+                        'indexed': ['proveedor', 'pais', 'region', 'modulo', 'moneda', 'fecha', 'timestamp_epoch']
                     }
                 )
                 logger.info(f"✅ Índice {self.index_name} creado")
@@ -69,8 +282,8 @@ class PineconeManager:
             raise
     
     def get_index(self):
-        """Obtener conexión al índice."""
-        return pinecone.Index(self.index_name)
+        """Obtener conexión al índice (compartida por todas las operaciones)."""
+        return self._index
     
     def create_embedding(self, text: str) -> List[float]:
         """
@@ -83,16 +296,94 @@ class PineconeManager:
             Lista de floats (embedding)
         """
         try:
-            # Limpiar y truncar texto si es muy largo
-            if len(text) > 1000:
-                text = text[:1000]
-            
-            embedding = self.embedding_model.encode(text)
-            return embedding.tolist()
+            return self.create_embeddings([text])[0].tolist()
         except Exception as e:
             logger.error(f"❌ Error creando embedding: {str(e)}")
             return []
     
+    def create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Crear embeddings para varios textos en lotes.
+        
+        Solo los textos que no están en la caché pasan por el modelo.
+        SentenceTransformer ordena internamente los textos por longitud antes de
+        agruparlos, así que cada lote tiene poco padding.
+        
+        Args:
+            texts: Textos a convertir en embeddings
+            
+        Returns:
+            Array (N textos x dimensión), en el mismo orden que texts
+        """
+        if not texts:
+            return np.empty((0, self.embedding_model.get_sentence_embedding_dimension()), dtype=np.float32)
+        
+        # Truncar textos muy largos
+        texts = [text[:MAX_TEXT_LENGTH] for text in texts]
+        
+        found = {}
+        with self._embedding_cache_lock:
+            for text in texts:
+                embedding = self._embedding_cache.get(text)
+                if embedding is not None:
+                    self._embedding_cache.move_to_end(text)
+                    found[text] = embedding
+        
+        # Textos distintos sin embedding en caché (dict.fromkeys conserva el orden)
+        misses = [text for text in dict.fromkeys(texts) if text not in found]
+        if misses:
+            # Normalizados: la caché semántica compara con un producto escalar
+            with torch.inference_mode():
+                computed = self.embedding_model.encode(
+                    misses,
+                    batch_size=EMBEDDING_BATCH_SIZE,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                )
+            with self._embedding_cache_lock:
+                for text, embedding in zip(misses, computed):
+                    # Copia por fila: la caché no retiene el array del lote completo
+                    embedding = embedding.copy()
+                    found[text] = embedding
+                    self._embedding_cache[text] = embedding
+                while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                    self._embedding_cache.popitem(last=False)
+        
+        return np.stack([found[text] for text in texts])
+    
+    def _build_metadata(self, text: str, metadata: Dict[str, Any],
+                        timestamp: str, timestamp_epoch: int) -> Dict[str, Any]:
+        """
+        Preparar la metadata que se guarda junto al vector.
+        
+        Args:
+            text: Texto almacenado
+            metadata: Metadata del análisis
+            timestamp: Marca de tiempo ISO de la escritura
+            timestamp_epoch: La misma marca en segundos desde epoch
+            
+        Returns:
+            Metadata en el formato del índice
+        """
+        get = metadata.get
+        return {
+            'texto': text[:MAX_TEXT_LENGTH],  # Truncar texto largo
+            'proveedor': get('proveedor', ''),
+            'pais': get('pais', ''),
+            'region': get('region', ''),
+            'modulo': get('modulo', ''),
+            'moneda': get('moneda', ''),
+            'precio': get('precio_estimado', ''),
+            'fecha': get('fecha_publicacion', ''),
+            'confianza': get('confianza', 0.0),
+            'fuente_url': get('url', ''),
+            'tipo_fuente': get('tipo_fuente', 'web'),
+            'validado_cruzado': get('validado_cruzado', False),
+            'timestamp': timestamp,
+            'timestamp_epoch': timestamp_epoch
+        }
+    
     def store_data(self, 
                    text: str, 
                    metadata: Dict[str, Any], 
@@ -109,37 +400,23 @@ class PineconeManager:
             True si se almacenó correctamente
         """
         try:
-            # Crear embedding
-            embedding = self.create_embedding(text)
-            if not embedding:
-                return False
+            # Crear embedding (array float32; se convierte a lista solo al enviarlo)
+            embedding = self.create_embeddings([text])[0]
             
-            # Generar ID si no se proporciona
+            # Generar ID si no se proporciona (único aunque haya varios por segundo)
             if not vector_id:
-                vector_id = f"{metadata.get('proveedor', 'unknown')}_{metadata.get('pais', 'unknown')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            # Preparar metadata
-            pinecone_metadata = {
-                'texto': text[:1000],  # Truncar texto largo
-                'proveedor': metadata.get('proveedor', ''),
-                'pais': metadata.get('pais', ''),
-                'region': metadata.get('region', ''),
-                'modulo': metadata.get('modulo', ''),
-                'moneda': metadata.get('moneda', ''),
-                'precio': metadata.get('precio_estimado', ''),
-                'fecha': metadata.get('fecha_publicacion', ''),
-                'confianza': metadata.get('confianza', 0.0),
-                'fuente_url': metadata.get('url', ''),
-                'tipo_fuente': metadata.get('tipo_fuente', 'web'),
-                'validado_cruzado': metadata.get('validado_cruzado', False),
-                'timestamp': datetime.now().isoformat()
-            }
+                vector_id = f"{metadata.get('proveedor', 'unknown')}_{metadata.get('pais', 'unknown')}_{uuid.uuid4().hex[:12]}"
+            
+            # Preparar metadata (una sola lectura del reloj)
+            now = datetime.now()
+            pinecone_metadata = self._build_metadata(text, metadata, now.isoformat(), int(now.timestamp()))
             
             # Insertar en Pinecone
-            index = self.get_index()
+            index = self._index
             index.upsert(
-                vectors=[(vector_id, embedding, pinecone_metadata)]
+                vectors=[(vector_id, embedding.tolist(), pinecone_metadata)]
             )
+            self._bump_version()
             
             logger.info(f"✅ Datos almacenados en Pinecone - ID: {vector_id}")
             return True
@@ -148,6 +425,168 @@ class PineconeManager:
             logger.error(f"❌ Error almacenando en Pinecone: {str(e)}")
             return False
     
+    def store_data_bulk(self, items: List[Tuple[str, Dict[str, Any], Optional[str]]]) -> int:
+        """
+        Almacenar varios textos con un solo cálculo de embeddings por lotes.
+        
+        Args:
+            items: Tuplas (texto, metadata, vector_id opcional)
+            
+        Returns:
+            Número de vectores almacenados
+        """
+        stored = sum(self._store_bulk(items))
+        if stored:
+            logger.info(f"✅ {stored} vectores almacenados en Pinecone")
+        return stored
+    
+    def _store_bulk(self, items: List[Tuple[str, Dict[str, Any], Optional[str]]]) -> List[bool]:
+        """
+        Almacenar varios textos e informar del resultado de cada uno.
+        
+        Un fallo en un tramo de embeddings o en un lote de upsert solo marca como
+        no almacenados los textos de ese tramo o lote.
+        
+        Args:
+            items: Tuplas (texto, metadata, vector_id opcional)
+            
+        Returns:
+            Lista con True por cada texto almacenado, en el mismo orden que items
+        """
+        stored = [False] * len(items)
+        if not items:
+            return stored
+        
+        # Truncar una sola vez: los recortes posteriores a MAX_TEXT_LENGTH no copian
+        texts = [text[:MAX_TEXT_LENGTH] for text, _, _ in items]
+        
+        # Una sola lectura del reloj para todo el lote
+        now = datetime.now()
+        timestamp = now.isoformat()
+        timestamp_epoch = int(now.timestamp())
+        
+        index = self._index
+        pending = []
+        try:
+            for shard_start in range(0, len(items), ENCODE_SHARD_SIZE):
+                shard_items = items[shard_start:shard_start + ENCODE_SHARD_SIZE]
+                shard_texts = texts[shard_start:shard_start + ENCODE_SHARD_SIZE]
+                try:
+                    embeddings = self.create_embeddings(shard_texts)
+                except Exception as e:
+                    logger.error(f"❌ Error creando embeddings del lote: {str(e)}")
+                    continue
+                
+                # Una sola conversión de la matriz a listas (el cliente REST serializa a JSON)
+                vectors = []
+                for text, (_, metadata, vector_id), embedding in zip(shard_texts, shard_items, embeddings.tolist()):
+                    # Generar ID si no se proporciona (único aunque haya varios por segundo)
+                    if not vector_id:
+                        vector_id = f"{metadata.get('proveedor', 'unknown')}_{metadata.get('pais', 'unknown')}_{uuid.uuid4().hex[:12]}"
+                    vectors.append((vector_id, embedding, self._build_metadata(text, metadata, timestamp, timestamp_epoch)))
+                
+                # Insertar el tramo por lotes sin esperar: se solapa con el siguiente encode
+                for start in range(0, len(vectors), UPSERT_BATCH_SIZE):
+                    batch = vectors[start:start + UPSERT_BATCH_SIZE]
+                    pending.append((shard_start + start, len(batch), index.upsert(vectors=batch, async_req=True)))
+            
+            for start, count, request in pending:
+                try:
+                    request.get()
+                    stored[start:start + count] = [True] * count
+                except Exception as e:
+                    logger.error(f"❌ Error almacenando lote en Pinecone: {str(e)}")
+            
+        except Exception as e:
+            logger.error(f"❌ Error almacenando lote en Pinecone: {str(e)}")
+        finally:
+            # Algún lote pudo escribirse aunque otro falle: invalidar igualmente
+            if pending:
+                self._bump_version()
+        
+        return stored
+    
+    def _bump_version(self):
+        """Registrar una escritura en el índice e invalidar las búsquedas cacheadas."""
+        self.version += 1
+        self.invalidate_query_cache()
+    
+    def invalidate_query_cache(self):
+        """Vaciar la caché de resultados de search_similar."""
+        with self._search_cache_lock:
+            self._search_cache.clear()
+    
+    def _search_cache_get(self, key: tuple, query_embedding: Optional[np.ndarray] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Buscar resultados cacheados de una búsqueda.
+        
+        Sin embedding se busca la clave exacta; con embedding, una consulta con los
+        mismos filtros y top_k cuya similitud coseno supere SEMANTIC_CACHE_THRESHOLD.
+        
+        Args:
+            key: Tupla (consulta, filtros serializados, top_k)
+            query_embedding: Embedding normalizado de la consulta (opcional)
+            
+        Returns:
+            Copia de la lista de resultados o None si no hay coincidencia vigente
+        """
+        now = time.time()
+        with self._search_cache_lock:
+            # Descartar entradas expiradas (las más antiguas están al principio)
+            while self._search_cache and now - next(iter(self._search_cache.values()))[0] >= SEARCH_CACHE_TTL:
+                self._search_cache.popitem(last=False)
+            
+            if query_embedding is None:
+                entry = self._search_cache.get(key)
+                return list(entry[2]) if entry is not None else None
+            
+            candidates = [
+                entry for cached_key, entry in self._search_cache.items()
+                if cached_key[1:] == key[1:]
+            ]
+        
+        if not candidates:
+            return None
+        
+        # Los embeddings del modelo están normalizados: el producto escalar es el coseno
+        similarities = np.stack([entry[1] for entry in candidates]) @ query_embedding
+        best = int(similarities.argmax())
+        if similarities[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return list(candidates[best][2])
+        return None
+    
+    def _search_cache_put(self, key: tuple, query_embedding: np.ndarray,
+                          results: List[Dict[str, Any]], version: int):
+        """
+        Guardar los resultados de una búsqueda.
+        
+        Args:
+            key: Tupla (consulta, filtros serializados, top_k)
+            query_embedding: Embedding normalizado de la consulta
+            results: Resultados formateados
+            version: Versión del índice al iniciar la búsqueda
+        """
+        with self._search_cache_lock:
+            # Hubo escrituras durante la búsqueda: los resultados pueden estar desfasados
+            if version != self.version:
+                return
+            self._search_cache.pop(key, None)
+            self._search_cache[key] = (time.time(), query_embedding, list(results))
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+    
+    async def astore_data_bulk(self, items: List[Tuple[str, Dict[str, Any], Optional[str]]]) -> int:
+        """
+        Versión asíncrona de store_data_bulk (se ejecuta en un hilo, sin bloquear el event loop).
+        
+        Args:
+            items: Tuplas (texto, metadata, vector_id opcional)
+            
+        Returns:
+            Número de vectores almacenados
+        """
+        return await asyncio.to_thread(self.store_data_bulk, items)
+    
     def search_similar(self, 
                       query: str, 
                       filters: Dict[str, Any] = None, 
@@ -164,11 +603,6 @@ class PineconeManager:
             Lista de resultados con metadata
         """
         try:
-            # Crear embedding de la consulta
-            query_embedding = self.create_embedding(query)
-            if not query_embedding:
-                return []
-            
             # Preparar filtros para Pinecone
             pinecone_filters = {}
             if filters:
@@ -176,24 +610,42 @@ class PineconeManager:
                     if value:
                         pinecone_filters[key] = value
             
+            version = self.version
+            
+            # Caché exacta: misma consulta, filtros y top_k sin escrituras desde entonces
+            cache_key = (query, json.dumps(pinecone_filters, sort_keys=True, default=str), top_k)
+            cached = self._search_cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Crear embedding de la consulta
+            try:
+                query_embedding = self.create_embeddings([query])[0]
+            except Exception as e:
+                logger.error(f"❌ Error creando embedding: {str(e)}")
+                return []
+            
+            # Caché semántica: una consulta casi idéntica con los mismos filtros
+            cached = self._search_cache_get(cache_key, query_embedding)
+            if cached is not None:
+                return cached
+            
             # Buscar en Pinecone
-            index = self.get_index()
+            index = self._index
             results = index.query(
-                vector=query_embedding,
+                vector=query_embedding.tolist(),
                 filter=pinecone_filters,
                 top_k=top_k,
                 include_metadata=True
             )
             
             # Formatear resultados
-            formatted_results = []
-            for match in results.matches:
-                result = {
-                    'id': match.id,
-                    'score': match.score,
-                    'metadata': match.metadata
-                }
-                formatted_results.append(result)
+            formatted_results = [
+                {'id': match.id, 'score': match.score, 'metadata': match.metadata}
+                for match in results.matches
+            ]
+            
+            self._search_cache_put(cache_key, query_embedding, formatted_results, version)
             
             logger.info(f"✅ Búsqueda completada - {len(formatted_results)} resultados")
             return formatted_results
@@ -244,38 +696,33 @@ class PineconeManager:
         
         return self.search_similar(query, filters, top_k)
     
-    def get_statistics(self) -> Dict[str, Any]:
+    def get_statistics(self, countries: Optional[List[str]] = None,
+                       modules: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Obtener estadísticas del índice Pinecone.
         
+        Los valores de countries/modules se cuentan en el servidor con un
+        describe_index_stats filtrado por valor. Los vectores con otros valores se
+        desglosan leyendo como máximo STATS_SAMPLE_SIZE de ellos; los que quedan
+        fuera de esa muestra o no tienen el campo se cuentan como 'Unknown'.
+        
+        Args:
+            countries: Países a contar en el servidor (por defecto STATS_COUNTRIES)
+            modules: Módulos a contar en el servidor (por defecto STATS_MODULES)
+            
         Returns:
             Diccionario con estadísticas
         """
         try:
-            index = self.get_index()
+            index = self._index
             stats = index.describe_index_stats()
             
-            # Contar por país
-            country_counts = {}
-            module_counts = {}
-            
-            # Obtener todos los vectores para análisis
-            all_vectors = index.query(
-                vector=[0] * 384,  # Vector dummy
-                top_k=10000,
-                include_metadata=True
-            )
+            # Todas las peticiones por valor en vuelo a la vez
+            country_requests = self._request_counts('pais', STATS_COUNTRIES if countries is None else countries)
+            module_requests = self._request_counts('modulo', STATS_MODULES if modules is None else modules)
             
-            for match in all_vectors.matches:
-                metadata = match.metadata
-                
-                # Contar países
-                country = metadata.get('pais', 'Unknown')
-                country_counts[country] = country_counts.get(country, 0) + 1
-                
-                # Contar módulos
-                module = metadata.get('modulo', 'Unknown')
-                module_counts[module] = module_counts.get(module, 0) + 1
+            country_counts = self._collect_counts('pais', country_requests, stats)
+            module_counts = self._collect_counts('modulo', module_requests, stats)
             
             return {
                 'total_vectors': stats.total_vector_count,
@@ -290,10 +737,68 @@ class PineconeManager:
             logger.error(f"❌ Error obteniendo estadísticas: {str(e)}")
             return {}
     
+    def _request_counts(self, field: str, values: List[str]) -> List[Tuple[str, Any]]:
+        """
+        Lanzar un describe_index_stats asíncrono filtrado por cada valor.
+        
+        Args:
+            field: Campo de metadata
+            values: Valores a contar
+            
+        Returns:
+            Pares (valor, petición asíncrona)
+        """
+        return [
+            (value, self._index.describe_index_stats(filter={field: value}, async_req=True))
+            for value in values
+        ]
+    
+    def _collect_counts(self, field: str, requests: List[Tuple[str, Any]], stats: Any) -> Dict[str, int]:
+        """
+        Reunir los conteos por valor y desglosar el resto con una muestra acotada.
+        
+        Args:
+            field: Campo de metadata
+            requests: Pares (valor, petición asíncrona de describe_index_stats)
+            stats: describe_index_stats del índice completo
+            
+        Returns:
+            Conteo por valor de metadata
+        """
+        counts = {}
+        for value, request in requests:
+            count = request.get().total_vector_count
+            if count:
+                counts[value] = count
+        
+        remainder = stats.total_vector_count - sum(counts.values())
+        if remainder <= 0:
+            return counts
+        
+        # Vectores con valores fuera de la lista: leer sus metadatos (acotado)
+        query_filter = {field: {'$nin': [value for value, _ in requests]}} if requests else None
+        sample = self._index.query(
+            vector=[1.0] + [0.0] * (stats.dimension - 1),  # Vector de sondeo (no nulo)
+            filter=query_filter,
+            top_k=min(remainder, STATS_SAMPLE_SIZE),
+            include_metadata=True
+        )
+        for match in sample.matches:
+            value = (match.metadata or {}).get(field) or 'Unknown'
+            counts[value] = counts.get(value, 0) + 1
+            remainder -= 1
+        
+        if remainder > 0:
+            counts['Unknown'] = counts.get('Unknown', 0) + remainder
+        return counts
+    
     def delete_old_data(self, days_old: int = 30) -> int:
         """
         Eliminar datos antiguos del índice.
         
+        Los vectores con timestamp_epoch se borran en el servidor con un filtro.
+        Los escritos antes de existir ese campo se migran con _migrate_legacy_vectors.
+        
         Args:
             days_old: Días de antigüedad para eliminar
             
@@ -303,40 +808,89 @@ class PineconeManager:
         try:
             from datetime import timedelta
             cutoff_date = datetime.now() - timedelta(days=days_old)
+            cutoff = int(cutoff_date.timestamp())
+            old_filter = {'timestamp_epoch': {'$lt': cutoff}}
             
-            # Buscar vectores antiguos
-            index = self.get_index()
-            old_vectors = index.query(
-                vector=[0] * 384,
-                top_k=10000,
-                include_metadata=True
-            )
-            
-            vectors_to_delete = []
-            for match in old_vectors.matches:
-                metadata = match.metadata
-                timestamp_str = metadata.get('timestamp', '')
-                
-                if timestamp_str:
-                    try:
-                        vector_date = datetime.fromisoformat(timestamp_str)
-                        if vector_date < cutoff_date:
-                            vectors_to_delete.append(match.id)
-                    except:
-                        continue
+            # Borrado en el servidor por filtro: sin enumerar ni parsear vectores
+            index = self._index
+            deleted = index.describe_index_stats(filter=old_filter).total_vector_count
+            if deleted:
+                index.delete(filter=old_filter)
+                self._bump_version()
             
-            # Eliminar vectores antiguos
-            if vectors_to_delete:
-                index.delete(ids=vectors_to_delete)
-                logger.info(f"✅ Eliminados {len(vectors_to_delete)} vectores antiguos")
-                return len(vectors_to_delete)
+            deleted += self._migrate_legacy_vectors(cutoff)
             
-            return 0
+            if deleted:
+                logger.info(f"✅ Eliminados {deleted} vectores antiguos")
+            return deleted
             
         except Exception as e:
             logger.error(f"❌ Error eliminando datos antiguos: {str(e)}")
             return 0
     
+    def _migrate_legacy_vectors(self, cutoff: int) -> int:
+        """
+        Procesar los vectores sin timestamp_epoch (escritos antes de existir el campo).
+        
+        Se leen por páginas, se parsea su 'timestamp' ISO y se eliminan los anteriores
+        al corte; al resto se le añade timestamp_epoch, de modo que las siguientes
+        limpiezas los cubre el filtro del servidor y esta ruta se queda sin trabajo.
+        
+        Args:
+            cutoff: Corte en segundos desde epoch
+            
+        Returns:
+            Número de vectores eliminados
+        """
+        index = self._index
+        legacy_filter = {'timestamp_epoch': {'$exists': False}}
+        deleted = 0
+        
+        try:
+            stats = index.describe_index_stats(filter=legacy_filter)
+            if not stats.total_vector_count:
+                return 0
+            
+            while True:
+                page = index.query(
+                    vector=[1.0] + [0.0] * (stats.dimension - 1),  # Vector de sondeo (no nulo)
+                    filter=legacy_filter,
+                    top_k=LEGACY_SCAN_SIZE,
+                    include_metadata=True
+                )
+                
+                to_delete = []
+                pending = []
+                for match in page.matches:
+                    try:
+                        epoch = int(datetime.fromisoformat((match.metadata or {}).get('timestamp', '')).timestamp())
+                    except (TypeError, ValueError):
+                        continue
+                    if epoch < cutoff:
+                        to_delete.append(match.id)
+                    else:
+                        pending.append(index.update(
+                            id=match.id, set_metadata={'timestamp_epoch': epoch}, async_req=True
+                        ))
+                
+                for start in range(0, len(to_delete), UPSERT_BATCH_SIZE):
+                    index.delete(ids=to_delete[start:start + UPSERT_BATCH_SIZE])
+                for request in pending:
+                    request.get()
+                
+                if to_delete or pending:
+                    self._bump_version()
+                deleted += len(to_delete)
+                
+                # Sin progreso (solo quedan vectores sin 'timestamp' válido) o última página
+                if not (to_delete or pending) or len(page.matches) < LEGACY_SCAN_SIZE:
+                    break
+            
+        except Exception as e:
+            logger.error(f"❌ Error migrando vectores sin timestamp_epoch: {str(e)}")
+        
+        return deleted
+    
     def validate_and_store(self, 
                           text: str, 
                           metadata: Dict[str, Any], 
@@ -352,54 +906,110 @@ class PineconeManager:
         Returns:
             Resultado de la validación y almacenamiento
         """
-        result = {
-            'stored': False,
-            'validated': False,
-            'confidence': 0.0,
-            'cross_reference': None,
-            'vector_id': None
-        }
+        return self.validate_and_store_bulk([(text, metadata)])[0]
+    
+    def validate_and_store_bulk(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Validar y almacenar varios textos con llamadas agrupadas.
         
-        try:
-            # Buscar datos similares existentes
-            similar_results = self.search_similar(text, top_k=5)
+        Un solo cálculo de embeddings para el lote, la búsqueda del vecino más
+        similar de cada texto en paralelo y un único almacenamiento por lotes (que reutiliza
+        los embeddings desde la caché), en lugar de embedding + consulta + upsert por texto.
+        
+        Args:
+            items: Tuplas (texto, metadata)
             
-            # Validar con datos existentes si hay
-            if similar_results:
-                best_match = similar_results[0]
-                
-                # Importar función de validación
-                from .extract_price import validate_cross_reference
-                
-                validation = validate_cross_reference(
-                    text, 
-                    best_match['metadata'].get('texto', ''), 
-                    metadata.get('modulo', '')
-                )
-                
-                result['cross_reference'] = validation
-                result['confidence'] = validation['confidence']
+        Returns:
+            Resultados de validación y almacenamiento, en el mismo orden que items
+        """
+        results = [
+            {
+                'stored': False,
+                'validated': False,
+                'confidence': 0.0,
+                'cross_reference': None,
+                'vector_id': None
+            }
+            for _ in items
+        ]
+        if not items:
+            return results
+        
+        try:
+            # Importar función de validación
+            from .extract_price import validate_cross_reference
+            
+            embeddings = self.create_embeddings([text for text, _ in items])
+            
+            # Buscar el dato existente más similar a cada texto, con las consultas en
+            # paralelo (query síncrono en hilos: la respuesta se procesa en el cliente)
+            with ThreadPoolExecutor(max_workers=min(INDEX_POOL_THREADS, len(items))) as executor:
+                searches = list(executor.map(self._nearest_match, embeddings.tolist()))
+            
+            to_store = []
+            for (text, metadata), result, matches in zip(items, results, searches):
+                # Validar con datos existentes si hay
+                if matches:
+                    validation = validate_cross_reference(
+                        text, 
+                        matches[0].metadata.get('texto', ''), 
+                        metadata.get('modulo', '')
+                    )
+                    
+                    result['cross_reference'] = validation
+                    result['confidence'] = validation['confidence']
+                    
+                    # Si la confianza es alta, marcar como validado
+                    if validation['confidence'] > 70:
+                        result['validated'] = True
+                        metadata['validado_cruzado'] = True
+                        metadata['confianza'] = max(metadata.get('confianza', 0), validation['confidence'])
                 
-                # Si la confianza es alta, marcar como validado
-                if validation['confidence'] > 70:
-                    result['validated'] = True
-                    metadata['validado_cruzado'] = True
-                    metadata['confianza'] = max(metadata.get('confianza', 0), validation['confidence'])
+                vector_id = f"{metadata.get('proveedor', 'unknown')}_{metadata.get('pais', 'unknown')}_{uuid.uuid4().hex[:12]}"
+                to_store.append((text, metadata, vector_id))
             
-            # Almacenar datos
-            vector_id = f"{metadata.get('proveedor', 'unknown')}_{metadata.get('pais', 'unknown')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            # Almacenar datos (resultado por texto: un lote fallido no afecta al resto)
+            for result, (_, _, vector_id), stored in zip(results, to_store, self._store_bulk(to_store)):
+                if stored:
+                    result['stored'] = True
+                    result['vector_id'] = vector_id
             
-            if self.store_data(text, metadata, vector_id):
-                result['stored'] = True
-                result['vector_id'] = vector_id
-            
-            return result
+            return results
             
         except Exception as e:
             logger.error(f"❌ Error en validación y almacenamiento: {str(e)}")
-            return result
+            return results
+    
+    def _nearest_match(self, embedding: List[float]) -> List[Any]:
+        """
+        Buscar el vector existente más similar a un embedding.
+        
+        Args:
+            embedding: Embedding de la consulta
+            
+        Returns:
+            Lista con la mejor coincidencia (vacía si no hay o si la búsqueda falla)
+        """
+        try:
+            return self._index.query(vector=embedding, top_k=1, include_metadata=True).matches
+        except Exception as e:
+            logger.error(f"❌ Error en búsqueda Pinecone: {str(e)}")
+            return []
+    
+    async def avalidate_and_store_bulk(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Versión asíncrona de validate_and_store_bulk (se ejecuta en un hilo, sin bloquear el event loop).
+        
+        Args:
+            items: Tuplas (texto, metadata)
+            
+        Returns:
+            Resultados de validación y almacenamiento, en el mismo orden que items
+        """
+        return await asyncio.to_thread(self.validate_and_store_bulk, items)
 
 # Función de utilidad para uso directo
+@lru_cache(maxsize=1)
 def get_pinecone_manager() -> PineconeManager:
-    """Obtener instancia del gestor de Pinecone."""
+    """Obtener la instancia compartida del gestor de Pinecone (se crea en la primera llamada)."""
     return PineconeManager() 
\ No newline at end of file